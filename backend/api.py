@@ -3,18 +3,43 @@ FastAPI Server for Excel Processing
 Connects the Python Excel engine to the Next.js frontend
 """
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
-from excel_processor import ExcelProcessor, ActionPlanner
-from typing import List, Dict, Any
+from excel_processor import ExcelProcessor, ActionPlanner, make_pool
+from change_set import ChangeSet
+from storage import get_storage
+import warmup
+from typing import List, Dict, Any, Optional
 import os
 import json
 import uuid
 from datetime import datetime, timedelta
-import shutil
 
-app = FastAPI(title="ExcelAI Processing API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Optionally load pandas/openpyxl before the worker accepts requests, and
+    start the plan pool once per worker rather than once per request
+    """
+    if warmup.prewarm_enabled():
+        warmup.prewarm()
+    app.state.plan_pool = make_pool(PLAN_WORKERS, PLAN_EXECUTOR) if PLAN_WORKERS > 1 else None
+    if app.state.plan_pool:
+        warmup.warm_pool(app.state.plan_pool, PLAN_WORKERS)
+    app.state.ready_ms = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 2)
+    yield
+    if app.state.plan_pool:
+        app.state.plan_pool.shutdown()
+
+
+app = FastAPI(title="ExcelAI Processing API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware for Next.js
 app.add_middleware(
@@ -25,14 +50,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# File storage configuration
-UPLOAD_DIR = "uploads"
-OUTPUT_DIR = "outputs"
+# File storage configuration (EXCELAI_STORAGE / EXCELAI_DATA_DIR)
+storage = get_storage()
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+MAX_DIFF_PAGE_SIZE = 5000
+MAX_PROFILE_TOP_K = 100  # Space-Saving eviction is O(k) per value
+MAX_PROFILE_SAMPLE_SIZE = 100_000  # Reservoir holds this many whole rows
+UPLOAD_TTL_SECONDS = 24 * 3600  # 24 hours
+OUTPUT_TTL_SECONDS = 48 * 3600  # 48 hours
 
-# Ensure directories exist
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Concurrent execution of independent column transforms within a plan
+PLAN_WORKERS = int(os.environ.get("EXCELAI_PLAN_WORKERS", "1"))
+PLAN_EXECUTOR = os.environ.get("EXCELAI_PLAN_EXECUTOR", "process")
 
 
 @app.get("/")
@@ -45,11 +74,28 @@ async def root():
             "upload": "/api/upload",
             "process": "/api/process",
             "preview": "/api/preview",
+            "profile": "/api/profile",
             "download": "/api/download/{job_id}",
+            "diff": "/api/diff/{job_id}",
+            "job": "/api/jobs/{job_id}",
+            "health": "/api/health",
         },
     }
 
 
+@app.get("/api/health")
+async def health():
+    """
+    Liveness check with this worker's startup-time report
+    """
+    return {
+        "status": "ok",
+        "pid": os.getpid(),
+        "readyMs": getattr(app.state, "ready_ms", None),
+        "prewarm": warmup.startup_report(),
+    }
+
+
 @app.post("/api/upload")
 async def upload_file(file: UploadFile = File(...)):
     """
@@ -65,17 +111,15 @@ async def upload_file(file: UploadFile = File(...)):
         
         # Generate unique file ID
         file_id = str(uuid.uuid4())
-        file_path = os.path.join(UPLOAD_DIR, f"{file_id}_{file.filename}")
         
         # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        file_path = storage.save_upload(file_id, file.filename, file.file)
         
         # Get file size
         file_size = os.path.getsize(file_path)
         
         if file_size > MAX_FILE_SIZE:
-            os.remove(file_path)
+            storage.delete_upload(file_id)
             raise HTTPException(
                 status_code=400,
                 detail=f"File too large. Maximum size is {MAX_FILE_SIZE / (1024*1024)}MB."
@@ -115,11 +159,7 @@ async def preview_file(file_id: str = Form(...)):
     """
     try:
         # Find file
-        file_path = None
-        for filename in os.listdir(UPLOAD_DIR):
-            if filename.startswith(file_id):
-                file_path = os.path.join(UPLOAD_DIR, filename)
-                break
+        file_path = storage.find_upload(file_id)
         
         if not file_path:
             raise HTTPException(status_code=404, detail="File not found")
@@ -169,21 +209,82 @@ async def preview_file(file_id: str = Form(...)):
         raise HTTPException(status_code=500, detail=f"Preview failed: {str(e)}")
 
 
+@app.post("/api/profile")
+async def profile_file(
+    file_id: str = Form(...),
+    sheet: Optional[str] = Form(None),
+    sample_size: Optional[int] = Form(None),
+    top_k: int = Form(10),
+    max_rows: Optional[int] = Form(None),
+):
+    """
+    Compute per-column data-quality statistics in a single streaming pass.
+    Pass sample_size to profile a uniform reservoir sample of large sheets;
+    this bounds memory, but every row is still read. Pass max_rows to stop
+    after the first max_rows data rows ("truncated" reports if more exist).
+    """
+    try:
+        # Find file
+        file_path = storage.find_upload(file_id)
+        
+        if not file_path:
+            raise HTTPException(status_code=404, detail="File not found")
+        
+        if sample_size is not None and not 1 <= sample_size <= MAX_PROFILE_SAMPLE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"sample_size must be between 1 and {MAX_PROFILE_SAMPLE_SIZE}"
+            )
+        
+        if max_rows is not None and max_rows < 1:
+            raise HTTPException(status_code=400, detail="max_rows must be positive")
+        
+        if not 1 <= top_k <= MAX_PROFILE_TOP_K:
+            raise HTTPException(
+                status_code=400,
+                detail=f"top_k must be between 1 and {MAX_PROFILE_TOP_K}"
+            )
+        
+        # Read-only mode streams rows instead of materializing every cell
+        processor = ExcelProcessor(file_path, read_only=True)
+        
+        try:
+            if sheet and sheet not in processor.workbook.sheetnames:
+                raise HTTPException(status_code=404, detail=f"Sheet '{sheet}' not found")
+            
+            start_time = datetime.now()
+            profile = processor.profile(sheet, sample_size=sample_size, top_k=top_k, max_rows=max_rows)
+        finally:
+            # Read-only workbooks keep the zip file open until closed
+            processor.workbook.close()
+        
+        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        
+        return {
+            "success": True,
+            "profile": profile,
+            "suggestedPlan": ActionPlanner.suggest_from_profile(profile),
+            "executionTimeMs": int(execution_time),
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Profiling failed: {str(e)}")
+
+
 @app.post("/api/process")
 async def process_file(
     file_id: str = Form(...),
     request_text: str = Form(...),
+    highlight_changes: bool = Form(False),
 ):
     """
     Process an Excel file based on natural language request
     """
     try:
         # Find uploaded file
-        file_path = None
-        for filename in os.listdir(UPLOAD_DIR):
-            if filename.startswith(file_id):
-                file_path = os.path.join(UPLOAD_DIR, filename)
-                break
+        file_path = storage.find_upload(file_id)
         
         if not file_path:
             raise HTTPException(status_code=404, detail="File not found")
@@ -201,22 +302,28 @@ async def process_file(
         processor = ExcelProcessor(file_path)
         start_time = datetime.now()
         
-        results = processor.execute_plan(plan)
+        results = processor.execute_plan(plan, pool=getattr(app.state, "plan_pool", None))
+        
+        if highlight_changes:
+            processor.highlight_changes()
         
         # Save output
         job_id = str(uuid.uuid4())
-        output_filename = f"{job_id}_output.xlsx"
-        output_path = os.path.join(OUTPUT_DIR, output_filename)
+        output_path = storage.output_path(job_id)
         processor.save(output_path)
         
+        # Persist cell-level changes so /api/diff never reloads workbooks
+        processor.change_set.save(storage.output_path(job_id, "diff.json"))
+        
         execution_time = (datetime.now() - start_time).total_seconds() * 1000
         
         # Get diff summary
         diff_summary = processor.get_diff_summary()
         
-        return {
+        job = {
             "success": True,
             "jobId": job_id,
+            "fileId": file_id,
             "status": "completed" if results["success"] else "failed",
             "plan": plan,
             "results": results,
@@ -225,6 +332,11 @@ async def process_file(
             "executionTimeMs": int(execution_time),
             "completedAt": datetime.now().isoformat(),
         }
+        
+        # Shared job state lets any worker answer follow-up requests
+        storage.put_job(job_id, job)
+        
+        return job
     
     except HTTPException:
         raise
@@ -238,15 +350,14 @@ async def download_result(job_id: str):
     Download processed Excel file
     """
     try:
-        output_filename = f"{job_id}_output.xlsx"
-        output_path = os.path.join(OUTPUT_DIR, output_filename)
+        output_path = storage.output_path(job_id)
         
         if not os.path.exists(output_path):
             raise HTTPException(status_code=404, detail="Result file not found")
         
         return FileResponse(
             path=output_path,
-            filename=output_filename,
+            filename=os.path.basename(output_path),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
     
@@ -256,6 +367,59 @@ async def download_result(job_id: str):
         raise HTTPException(status_code=500, detail=f"Download failed: {str(e)}")
 
 
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Fetch the stored state of a processing job
+    """
+    job = storage.get_job(job_id)
+    
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job
+
+
+@app.get("/api/diff/{job_id}")
+async def get_diff(
+    job_id: str,
+    offset: int = 0,
+    limit: int = 1000,
+    deleted_offset: int = 0,
+    deleted_limit: int = 1000,
+):
+    """
+    Page through the cell-level changes and deleted row ranges recorded
+    while processing a job
+    """
+    try:
+        if (
+            offset < 0 or deleted_offset < 0
+            or not 1 <= limit <= MAX_DIFF_PAGE_SIZE
+            or not 1 <= deleted_limit <= MAX_DIFF_PAGE_SIZE
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"offsets must be >= 0 and limits between 1 and {MAX_DIFF_PAGE_SIZE}"
+            )
+        
+        diff_path = storage.output_path(job_id, "diff.json")
+        
+        if not os.path.exists(diff_path):
+            raise HTTPException(status_code=404, detail="Diff not found")
+        
+        return {
+            "success": True,
+            "jobId": job_id,
+            "diff": ChangeSet.read_page(diff_path, offset, limit, deleted_offset, deleted_limit),
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Diff failed: {str(e)}")
+
+
 @app.post("/api/parse")
 async def parse_request(request_text: str = Form(...)):
     """
@@ -282,25 +446,9 @@ async def cleanup_old_files():
     """
     try:
         now = datetime.now()
-        deleted_count = 0
         
-        # Clean uploads older than 24 hours
-        for filename in os.listdir(UPLOAD_DIR):
-            file_path = os.path.join(UPLOAD_DIR, filename)
-            file_age = now - datetime.fromtimestamp(os.path.getctime(file_path))
-            
-            if file_age.total_seconds() > 24 * 3600:  # 24 hours
-                os.remove(file_path)
-                deleted_count += 1
-        
-        # Clean outputs older than 48 hours
-        for filename in os.listdir(OUTPUT_DIR):
-            file_path = os.path.join(OUTPUT_DIR, filename)
-            file_age = now - datetime.fromtimestamp(os.path.getctime(file_path))
-            
-            if file_age.total_seconds() > 48 * 3600:  # 48 hours
-                os.remove(file_path)
-                deleted_count += 1
+        # Uploads expire after 24 hours, outputs after 48 hours
+        deleted_count = storage.cleanup(UPLOAD_TTL_SECONDS, OUTPUT_TTL_SECONDS)
         
         return {
             "success": True,
@@ -313,6 +461,7 @@ async def cleanup_old_files():
 
 
 if __name__ == "__main__":
+    # Development server; use serve.py for multi-worker production runs
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=True)
 
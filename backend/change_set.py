@@ -0,0 +1,259 @@
+"""
+Cell-Level Change Tracking
+Records workbook edits in a compact columnar change set so diffs can be
+served without reloading the input and output workbooks
+"""
+
+import json
+import os
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, time
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+
+# Entries per chunk file; a page read only opens the chunks it overlaps
+DIFF_CHUNK_SIZE = 1000
+
+CHANGE_FIELDS = ("sheet", "row", "column", "old", "new", "action")
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert a cell value into something json.dump accepts"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return _jsonable(value.item())  # numpy scalars written by pandas actions
+    return str(value)
+
+
+def _chunk_path(path: str, kind: str, index: int) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.{kind}{index}{ext}"
+
+
+def _read_chunks(
+    path: str, kind: str, total: int, chunk_size: int, offset: int, limit: Optional[int]
+) -> Iterator[Tuple[Any, slice]]:
+    """Yield (chunk, slice within chunk) for the chunk files covering a page"""
+    end = total if limit is None else min(total, offset + limit)
+    if offset >= end:
+        return
+    for index in range(offset // chunk_size, (end - 1) // chunk_size + 1):
+        with open(_chunk_path(path, kind, index), "r", encoding="utf-8") as f:
+            chunk = json.load(f)
+        base = index * chunk_size
+        yield chunk, slice(max(offset, base) - base, min(end, base + chunk_size) - base)
+
+
+class ChangeSet:
+    """
+    Columnar store of cell edits and deleted row ranges.
+
+    Each cell edit is one slot across parallel arrays (sheet, row, column,
+    old value, new value, action id). Sheet names are interned so each
+    edit costs a few machine ints plus the two values. Row numbers refer to
+    the sheet as it was when the action ran; deleted rows are stored as
+    inclusive (start, end) ranges instead of one entry per row.
+    """
+
+    def __init__(self):
+        self.sheet_names: List[str] = []
+        self._sheet_ids: Dict[str, int] = {}
+        self.sheets = array("H")
+        self.rows = array("L")
+        self.columns = array("H")
+        self.actions = array("l")
+        self.old_values: List[Any] = []
+        self.new_values: List[Any] = []
+        self.deleted_rows: List[Dict[str, Any]] = []
+        # Number of cell edits recorded before each deleted range
+        self._deletion_marks: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _sheet_id(self, sheet_name: str) -> int:
+        sheet_id = self._sheet_ids.get(sheet_name)
+        if sheet_id is None:
+            sheet_id = len(self.sheet_names)
+            self.sheet_names.append(sheet_name)
+            self._sheet_ids[sheet_name] = sheet_id
+        return sheet_id
+
+    def record(self, sheet_name: str, row: int, column: int, old: Any, new: Any, action_id: int = -1):
+        """Record a single cell edit"""
+        self.sheets.append(self._sheet_id(sheet_name))
+        self.rows.append(row)
+        self.columns.append(column)
+        self.actions.append(action_id)
+        self.old_values.append(_jsonable(old))
+        self.new_values.append(_jsonable(new))
+
+    def record_column(
+        self,
+        sheet_name: str,
+        column: int,
+        rows: List[int],
+        old_values: List[Any],
+        new_values: List[Any],
+        action_id: int = -1,
+    ):
+        """Record edits to many rows of one column in a single call"""
+        count = len(rows)
+        self.sheets.extend(array("H", [self._sheet_id(sheet_name)]) * count)
+        self.rows.extend(rows)
+        self.columns.extend(array("H", [column]) * count)
+        self.actions.extend(array("l", [action_id]) * count)
+        self.old_values.extend(map(_jsonable, old_values))
+        self.new_values.extend(map(_jsonable, new_values))
+
+    def record_deleted_rows(self, sheet_name: str, rows: Iterable[int], action_id: int = -1):
+        """Record deleted rows, collapsing consecutive row numbers into ranges"""
+        start = end = None
+        for row in sorted(rows):
+            if end is not None and row == end + 1:
+                end = row
+                continue
+            if start is not None:
+                self._add_deleted_range(sheet_name, start, end, action_id)
+            start = end = row
+        if start is not None:
+            self._add_deleted_range(sheet_name, start, end, action_id)
+
+    def _add_deleted_range(self, sheet_name: str, start: int, end: int, action_id: int):
+        self._deletion_marks.append(len(self))
+        self.deleted_rows.append({
+            "sheet": sheet_name,
+            "start": start,
+            "end": end,
+            "action": action_id,
+        })
+
+    def deleted_row_count(self) -> int:
+        return sum(r["end"] - r["start"] + 1 for r in self.deleted_rows)
+
+    def current_cells(self) -> Iterator[Tuple[str, int, int]]:
+        """
+        Yield (sheet_name, row, column) for every edited cell, translated to
+        the sheet's current row numbers. Cells whose row was deleted by a
+        later action are skipped.
+        """
+        # Group deleted ranges by the deletion that produced them; each group
+        # is expressed in the row numbers of the sheet at that moment.
+        groups: List[Tuple[Tuple[int, str, int], List[int], List[int], List[int]]] = []
+        for mark, rng in zip(self._deletion_marks, self.deleted_rows):
+            key = (mark, rng["sheet"], rng["action"])
+            if not groups or groups[-1][0] != key:
+                groups.append((key, [], [], [0]))
+            _, starts, ends, removed = groups[-1]
+            starts.append(rng["start"])
+            ends.append(rng["end"])
+            removed.append(removed[-1] + rng["end"] - rng["start"] + 1)
+
+        for i in range(len(self)):
+            sheet_name = self.sheet_names[self.sheets[i]]
+            row = self.rows[i]
+            for (mark, group_sheet, _), starts, ends, removed in groups:
+                if mark <= i or group_sheet != sheet_name:
+                    continue
+                k = bisect_right(starts, row)
+                if k and row <= ends[k - 1]:
+                    row = None
+                    break
+                row -= removed[k]
+            if row is not None:
+                yield sheet_name, row, self.columns[i]
+
+    def to_dict(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        deleted_offset: int = 0,
+        deleted_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Serialize a page of cell edits and a page of deleted row ranges"""
+        page = slice(offset, len(self) if limit is None else offset + limit)
+        deleted_page = slice(
+            deleted_offset,
+            len(self.deleted_rows) if deleted_limit is None else deleted_offset + deleted_limit,
+        )
+        return {
+            "total": len(self),
+            "offset": offset,
+            "limit": limit,
+            "sheet_names": list(self.sheet_names),
+            "changes": {
+                "sheet": self.sheets[page].tolist(),
+                "row": self.rows[page].tolist(),
+                "column": self.columns[page].tolist(),
+                "old": self.old_values[page],
+                "new": self.new_values[page],
+                "action": self.actions[page].tolist(),
+            },
+            "deleted_total": len(self.deleted_rows),
+            "deleted_offset": deleted_offset,
+            "deleted_limit": deleted_limit,
+            "deleted_rows": self.deleted_rows[deleted_page],
+        }
+
+    def save(self, path: str, chunk_size: int = DIFF_CHUNK_SIZE):
+        """
+        Write the change set as a small manifest at path plus fixed-size
+        chunk files next to it, so read_page() can seek to any page
+        """
+        for index, start in enumerate(range(0, len(self), chunk_size)):
+            chunk = self.to_dict(start, chunk_size, 0, 0)["changes"]
+            with open(_chunk_path(path, "c", index), "w", encoding="utf-8") as f:
+                json.dump(chunk, f, separators=(",", ":"))
+
+        for index, start in enumerate(range(0, len(self.deleted_rows), chunk_size)):
+            with open(_chunk_path(path, "d", index), "w", encoding="utf-8") as f:
+                json.dump(self.deleted_rows[start:start + chunk_size], f, separators=(",", ":"))
+
+        # Manifest last: readers never see it before its chunks exist
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "total": len(self),
+                "deleted_total": len(self.deleted_rows),
+                "chunk_size": chunk_size,
+                "sheet_names": self.sheet_names,
+            }, f, separators=(",", ":"))
+
+    @staticmethod
+    def read_page(
+        path: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        deleted_offset: int = 0,
+        deleted_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Read one page of a saved change set without loading the rest"""
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        chunk_size = manifest["chunk_size"]
+
+        changes: Dict[str, List[Any]] = {field: [] for field in CHANGE_FIELDS}
+        for chunk, part in _read_chunks(path, "c", manifest["total"], chunk_size, offset, limit):
+            for field in CHANGE_FIELDS:
+                changes[field].extend(chunk[field][part])
+
+        deleted_rows: List[Dict[str, Any]] = []
+        for chunk, part in _read_chunks(
+            path, "d", manifest["deleted_total"], chunk_size, deleted_offset, deleted_limit
+        ):
+            deleted_rows.extend(chunk[part])
+
+        return {
+            "total": manifest["total"],
+            "offset": offset,
+            "limit": limit,
+            "sheet_names": manifest["sheet_names"],
+            "changes": changes,
+            "deleted_total": manifest["deleted_total"],
+            "deleted_offset": deleted_offset,
+            "deleted_limit": deleted_limit,
+            "deleted_rows": deleted_rows,
+        }
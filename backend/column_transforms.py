@@ -0,0 +1,49 @@
+"""
+Column Transforms
+Pure functions over column arrays (lists of cell values) used by
+ExcelProcessor. They hold no workbook state, so they can run on a thread
+or process pool; each returns (new_values, stats).
+"""
+
+import re
+from typing import List, Dict, Any, Tuple
+from phone_numbers import get_normalizer
+
+
+CONTROL_CHARS = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+
+
+def clean_text(values: List[Any]) -> Tuple[List[Any], Dict[str, Any]]:
+    """Trim strings and strip non-printable characters"""
+    cleaned = []
+    for value in values:
+        if isinstance(value, str):
+            value = CONTROL_CHARS.sub('', value.strip())
+        cleaned.append(value)
+    return cleaned, {}
+
+
+def standardize_phone(values: List[Any], country_code: str = "234") -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Format phone numbers per country rules (e.g. +234-803-123-4567); values
+    without an international prefix are read as country_code numbers.
+    Invalid numbers are left unchanged and counted in stats.
+    """
+    return get_normalizer(country_code).normalize_batch(values)
+
+
+def convert_dates(values: List[Any]) -> Tuple[List[Any], Dict[str, Any]]:
+    """Parse values into dates; stats["converted"] lists the positions parsed"""
+    import pandas as pd
+
+    converted_values = []
+    converted = []
+    for i, value in enumerate(values):
+        if value:
+            try:
+                value = pd.to_datetime(value).date()
+                converted.append(i)
+            except Exception:
+                pass  # Keep original if parsing fails
+        converted_values.append(value)
+    return converted_values, {"converted": converted}
@@ -0,0 +1,21 @@
+"""
+Shared pytest fixtures
+"""
+
+import pytest
+import openpyxl
+
+
+@pytest.fixture
+def make_workbook(tmp_path):
+    """Factory: save rows (header first) to a one-sheet workbook and return its path"""
+    def _make(rows, title="Sheet1", name="book.xlsx"):
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = title
+        for row in rows:
+            ws.append(row)
+        path = tmp_path / name
+        wb.save(path)
+        return str(path)
+    return _make
@@ -0,0 +1,342 @@
+"""
+Data Profiling Engine
+Computes per-column data-quality statistics in a single streaming pass
+using bounded-memory sketches (HyperLogLog, Space-Saving, reservoir sampling)
+"""
+
+import hashlib
+import math
+import random
+import re
+from datetime import date, datetime
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+
+PHONE_PATTERN = re.compile(r'^\+?[\d\s\-().]{7,20}$')
+
+DATE_PATTERNS = [
+    ("YYYY-MM-DD", re.compile(r'^\d{4}-\d{1,2}-\d{1,2}$')),
+    ("YYYY/MM/DD", re.compile(r'^\d{4}/\d{1,2}/\d{1,2}$')),
+    ("DD/MM/YYYY", re.compile(r'^\d{1,2}/\d{1,2}/\d{4}$')),
+    ("DD-MM-YYYY", re.compile(r'^\d{1,2}-\d{1,2}-\d{4}$')),
+    ("DD.MM.YYYY", re.compile(r'^\d{1,2}\.\d{1,2}\.\d{4}$')),
+    ("D MMM YYYY", re.compile(r'^\d{1,2} [A-Za-z]{3,9},? \d{4}$')),
+    ("MMM D, YYYY", re.compile(r'^[A-Za-z]{3,9} \d{1,2},? \d{4}$')),
+]
+
+NUMBER_PATTERN = re.compile(r'^[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?$')
+
+
+def _hash64(value: Any) -> int:
+    """Stable 64-bit hash of a cell value (independent of PYTHONHASHSEED)"""
+    digest = hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """Approximate distinct counter with ~1.04/sqrt(2^precision) relative error"""
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self._shift = 64 - precision
+        self._mask = (1 << self._shift) - 1
+
+    def add(self, value: Any):
+        h = _hash64(value)
+        idx = h >> self._shift
+        w = h & self._mask
+        rank = self._shift - w.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def count(self) -> int:
+        m = self.m
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        # Small-range correction (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """Top-k heavy hitters using the Space-Saving algorithm"""
+
+    def __init__(self, k: int = 10):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.counts: Dict[Any, int] = {}
+        self.errors: Dict[Any, int] = {}
+
+    def add(self, value: Any):
+        if value in self.counts:
+            self.counts[value] += 1
+            return
+
+        if len(self.counts) < self.k:
+            self.counts[value] = 1
+            self.errors[value] = 0
+            return
+
+        # Replace the current minimum; its count becomes our error bound
+        victim = min(self.counts, key=self.counts.__getitem__)
+        floor = self.counts.pop(victim)
+        self.errors.pop(victim)
+        self.counts[value] = floor + 1
+        self.errors[value] = floor
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[Any, int, int]]:
+        """Return (value, estimated_count, max_overestimate) sorted by count"""
+        items = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        return [(value, count, self.errors[value]) for value, count in items[:n or self.k]]
+
+
+def classify_value(value: Any) -> str:
+    """Classify a single cell value as null, boolean, number, date or text"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, (datetime, date)):
+        return "date"
+
+    text = str(value).strip()
+    if not text:
+        return "null"
+    if NUMBER_PATTERN.match(text):
+        return "number"
+    if detect_date_format(text):
+        return "date"
+    return "text"
+
+
+def detect_date_format(text: str) -> Optional[str]:
+    """Return the name of the first matching date pattern, if any"""
+    for name, pattern in DATE_PATTERNS:
+        if pattern.match(text):
+            return name
+    return None
+
+
+def looks_like_phone(value: Any) -> bool:
+    """
+    Heuristic check for phone-number-shaped values. Only text counts:
+    numeric cells are usually amounts or IDs, and dates such as
+    "2024-01-05" share the digits-and-separators shape.
+    """
+    if not isinstance(value, str):
+        return False
+    text = value.strip()
+    if not PHONE_PATTERN.match(text) or detect_date_format(text):
+        return False
+    digit_count = sum(ch.isdigit() for ch in text)
+    return 7 <= digit_count <= 15
+
+
+class ColumnProfile:
+    """Streaming accumulator for a single column"""
+
+    def __init__(self, name: str, top_k: int = 10, hll_precision: int = 12):
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        self.whitespace = 0
+        self.phones = 0
+        self.type_counts: Dict[str, int] = {}
+        self.date_formats: Dict[str, int] = {}
+        self.distinct = HyperLogLog(hll_precision)
+        self.top_values = SpaceSaving(top_k)
+        self._min: Dict[str, Any] = {}
+        self._max: Dict[str, Any] = {}
+
+    def add(self, value: Any):
+        self.count += 1
+        kind = classify_value(value)
+
+        if kind == "null":
+            self.nulls += 1
+            return
+
+        self.type_counts[kind] = self.type_counts.get(kind, 0) + 1
+        self.distinct.add(value)
+        self.top_values.add(value)
+
+        if isinstance(value, str):
+            if value != value.strip():
+                self.whitespace += 1
+            fmt = detect_date_format(value.strip())
+            if fmt:
+                self.date_formats[fmt] = self.date_formats.get(fmt, 0) + 1
+        elif isinstance(value, (datetime, date)):
+            self.date_formats["native"] = self.date_formats.get("native", 0) + 1
+
+        if looks_like_phone(value):
+            self.phones += 1
+
+        comparable = self._comparable(kind, value)
+        if comparable is not None:
+            if kind not in self._min or comparable < self._min[kind]:
+                self._min[kind] = comparable
+            if kind not in self._max or comparable > self._max[kind]:
+                self._max[kind] = comparable
+
+    @staticmethod
+    def _comparable(kind: str, value: Any) -> Any:
+        if kind == "number":
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+        if kind == "date":
+            if isinstance(value, datetime):
+                return value
+            if isinstance(value, date):
+                return datetime(value.year, value.month, value.day)
+            return None
+        if kind in ("text", "boolean"):
+            return str(value)
+        return None
+
+    def inferred_type(self) -> str:
+        non_null = self.count - self.nulls
+        if not non_null:
+            return "empty"
+        kind, hits = max(self.type_counts.items(), key=lambda kv: kv[1])
+        return kind if hits / non_null >= 0.9 else "mixed"
+
+    def to_dict(self) -> Dict[str, Any]:
+        non_null = self.count - self.nulls
+        kind = self.inferred_type()
+        date_hits = sum(self.date_formats.values())
+
+        def rate(hits: int, total: int) -> float:
+            return round(hits / total, 4) if total else 0.0
+
+        def jsonable(value: Any) -> Any:
+            if value is None or isinstance(value, (bool, int, float, str)):
+                return value
+            if isinstance(value, (datetime, date)):
+                return value.isoformat()
+            return str(value)
+
+        return {
+            "name": self.name,
+            "count": self.count,
+            "null_count": self.nulls,
+            "null_rate": rate(self.nulls, self.count),
+            "approx_distinct": min(self.distinct.count(), non_null),
+            "top_values": [
+                {"value": jsonable(v), "count": c, "error": e}
+                for v, c, e in self.top_values.top()
+            ],
+            "min": jsonable(self._min.get(kind)),
+            "max": jsonable(self._max.get(kind)),
+            "inferred_type": kind,
+            "type_counts": dict(self.type_counts),
+            "whitespace_rate": rate(self.whitespace, non_null),
+            "phone_rate": rate(self.phones, non_null),
+            "date_rate": rate(date_hits, non_null),
+            "date_formats": dict(self.date_formats),
+        }
+
+
+class DataProfiler:
+    """Profile worksheet columns in bounded time and memory"""
+
+    def __init__(
+        self,
+        sample_size: Optional[int] = None,
+        top_k: int = 10,
+        hll_precision: int = 12,
+        seed: Optional[int] = None,
+        max_rows: Optional[int] = None,
+    ):
+        self.sample_size = sample_size
+        # Reservoir sampling bounds memory but still reads every row;
+        # max_rows bounds the time as well by scanning only the first rows
+        self.max_rows = max_rows
+        self.top_k = top_k
+        self.hll_precision = hll_precision
+        self.seed = seed
+
+    def profile_sheet(self, sheet) -> Dict[str, Any]:
+        """Profile a worksheet whose first row holds the column headers"""
+        rows = sheet.iter_rows(values_only=True)
+        header_row = next(rows, None) or ()
+        headers = [
+            str(h) if h not in (None, "") else f"Column{i}"
+            for i, h in enumerate(header_row, start=1)
+        ]
+        result = self.profile_rows(headers, rows)
+        result["sheet"] = sheet.title
+        return result
+
+    def profile_rows(self, headers: List[str], rows: Iterable[Tuple]) -> Dict[str, Any]:
+        """Profile an iterable of row tuples against the given headers"""
+        headers = list(headers)
+        columns = [ColumnProfile(h, self.top_k, self.hll_precision) for h in headers]
+        rows_scanned = 0
+        
+        source = iter(rows)
+        if self.max_rows is not None:
+            rows = islice(source, self.max_rows)
+
+        if self.sample_size:
+            rows, rows_scanned = self._reservoir(rows)
+
+        for row in rows:
+            if not self.sample_size:
+                rows_scanned += 1
+
+            # Ragged rows: grow the column set to match
+            while len(columns) < len(row):
+                name = f"Column{len(columns) + 1}"
+                headers.append(name)
+                column = ColumnProfile(name, self.top_k, self.hll_precision)
+                column.count = column.nulls = columns[0].count if columns else 0
+                columns.append(column)
+
+            for i, column in enumerate(columns):
+                column.add(row[i] if i < len(row) else None)
+
+        profiled = columns[0].count if columns else 0
+        truncated = self.max_rows is not None and next(source, None) is not None
+        return {
+            "rows_scanned": rows_scanned,
+            "rows_profiled": profiled,
+            "sampled": bool(self.sample_size) and profiled < rows_scanned,
+            "truncated": truncated,
+            "columns": [column.to_dict() for column in columns],
+        }
+
+    def _reservoir(self, rows: Iterable[Tuple]) -> Tuple[List[Tuple], int]:
+        """Algorithm R: uniform sample of sample_size rows in one pass"""
+        rng = random.Random(self.seed)
+        reservoir: List[Tuple] = []
+        seen = 0
+
+        for row in rows:
+            seen += 1
+            if len(reservoir) < self.sample_size:
+                reservoir.append(row)
+            else:
+                j = rng.randrange(seen)
+                if j < self.sample_size:
+                    reservoir[j] = row
+
+        return reservoir, seen
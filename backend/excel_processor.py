@@ -1,27 +1,62 @@
 """
 Excel Processing Engine
 Handles all Excel file manipulations using openpyxl and pandas
+
+openpyxl and pandas are imported inside the methods that use them so that
+importing this module (e.g. for ActionPlanner) stays cheap; see warmup.py
+for loading them ahead of the first request.
 """
 
-import openpyxl
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import PatternFill, Font, Alignment
-import pandas as pd
-from typing import List, Dict, Any, Optional
-import re
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from data_profiler import DataProfiler
+from change_set import ChangeSet
+from styling import StyleRegistry, CHANGED, INVALID, DATE
+from scheduler import next_wave, resolve_columns, COLUMN_ACTIONS
+import column_transforms
+import warmup
+
+
+def make_pool(max_workers: int, executor: str = "process") -> Executor:
+    """Pool for ExcelProcessor.execute_plan; create once and reuse it across plans"""
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=warmup.init_worker)
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown executor: {executor}")
 
 
 class ExcelProcessor:
     """Main Excel processing engine"""
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, read_only: bool = False):
+        import openpyxl
+        
         self.file_path = file_path
-        self.workbook = openpyxl.load_workbook(file_path)
+        self.workbook = openpyxl.load_workbook(file_path, read_only=read_only)
         self.changes_log = []
+        self.change_set = ChangeSet()
+        self.validation: Dict[str, Dict[str, int]] = {}
+        self.styles = StyleRegistry(self.workbook)
+        self._action_id = -1
     
-    def execute_plan(self, plan: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Execute a series of Excel actions based on the plan"""
+    def execute_plan(
+        self,
+        plan: List[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        executor: str = "process",
+        pool: Optional[Executor] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute a series of Excel actions based on the plan.
+        
+        Given a pool (see make_pool), consecutive actions that touch disjoint
+        columns (see scheduler.next_wave) run their column transforms
+        concurrently on it; results match serial execution. The caller owns
+        the pool. Without one, max_workers > 1 creates a "process" or
+        "thread" pool for this call only.
+        """
         results = {
             "success": True,
             "actions_completed": 0,
@@ -29,55 +64,234 @@ class ExcelProcessor:
             "errors": []
         }
         
-        for action in plan:
-            try:
-                action_type = action.get("type")
-                params = action.get("params", {})
-                
-                if action_type == "trim_clean":
-                    self._trim_clean(params)
-                elif action_type == "remove_duplicates":
-                    self._remove_duplicates(params)
-                elif action_type == "split_column":
-                    self._split_column(params)
-                elif action_type == "create_pivot":
-                    self._create_pivot(params)
-                elif action_type == "standardize_phone":
-                    self._standardize_phone(params)
-                elif action_type == "convert_dates":
-                    self._convert_dates(params)
-                elif action_type == "add_calculated_column":
-                    self._add_calculated_column(params)
+        owned_pool = None
+        if pool is None and max_workers and max_workers > 1:
+            pool = owned_pool = make_pool(max_workers, executor)
+        
+        try:
+            start = 0
+            while start < len(plan):
+                # Waves are planned against the live header rows, since
+                # earlier actions may rename or add columns
+                if pool:
+                    wave = next_wave(plan, start, self.workbook.sheetnames[0], self._header_rows())
                 else:
-                    results["errors"].append(f"Unknown action type: {action_type}")
-                    continue
+                    wave = [(start, None)]
+                start = wave[-1][0] + 1
                 
+                # Column actions fan out per column, so even a lone trim_clean
+                # over a wide sheet uses the pool
+                action_id = wave[0][0]
+                if pool and plan[action_id].get("type") in COLUMN_ACTIONS:
+                    self._execute_wave(plan, wave, pool, results)
+                else:
+                    self._execute_action(action_id, plan[action_id], results)
+        finally:
+            if owned_pool:
+                owned_pool.shutdown()
+        
+        self._action_id = -1
+        return results
+    
+    def _execute_action(self, action_id: int, action: Dict[str, Any], results: Dict[str, Any]):
+        """Run a single action and record its outcome in results"""
+        self._action_id = action_id
+        try:
+            action_type = action.get("type")
+            params = action.get("params", {})
+            
+            if action_type == "trim_clean":
+                self._trim_clean(params)
+            elif action_type == "remove_duplicates":
+                self._remove_duplicates(params)
+            elif action_type == "split_column":
+                self._split_column(params)
+            elif action_type == "create_pivot":
+                self._create_pivot(params)
+            elif action_type == "standardize_phone":
+                self._standardize_phone(params)
+            elif action_type == "convert_dates":
+                self._convert_dates(params)
+            elif action_type == "add_calculated_column":
+                self._add_calculated_column(params)
+            else:
+                results["errors"].append(f"Unknown action type: {action_type}")
+                return
+            
+            results["actions_completed"] += 1
+            results["changes"].append(action.get("description", action_type))
+            
+        except Exception as e:
+            results["errors"].append(f"Error in {action_type}: {str(e)}")
+            results["success"] = False
+    
+    def _header_rows(self) -> Dict[str, List[Any]]:
+        return {
+            sheet.title: list(next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ()))
+            for sheet in self.workbook.worksheets
+        }
+    
+    def _execute_wave(
+        self,
+        plan: List[Dict[str, Any]],
+        wave: List[Tuple[int, Dict[str, Any]]],
+        pool: Executor,
+        results: Dict[str, Any],
+    ):
+        """Run independent column actions concurrently, then apply them in plan order"""
+        pending = []
+        for action_id, footprint in wave:
+            action = plan[action_id]
+            action_type = action.get("type")
+            try:
+                # Columns were resolved by the scheduler, which saw the header
+                # edits of earlier actions in this wave
+                tasks = self._column_tasks(
+                    action_type, action.get("params", {}),
+                    footprint["columns"], footprint["header_only"],
+                )
+                futures = [
+                    pool.submit(task["func"], task["values"], **task["kwargs"])
+                    for task in tasks
+                ]
+                pending.append((action_id, action, tasks, futures))
+            except Exception as e:
+                pending.append((action_id, action, None, e))
+        
+        for action_id, action, tasks, futures in pending:
+            self._action_id = action_id
+            action_type = action.get("type")
+            try:
+                if tasks is None:
+                    raise futures
+                outputs = [future.result() for future in futures]
+                self._apply_column_results(action_type, action.get("params", {}), tasks, outputs)
                 results["actions_completed"] += 1
                 results["changes"].append(action.get("description", action_type))
-                
             except Exception as e:
                 results["errors"].append(f"Error in {action_type}: {str(e)}")
                 results["success"] = False
-        
-        return results
     
-    def _trim_clean(self, params: Dict[str, Any]):
-        """Remove leading/trailing spaces and clean non-printable characters"""
+    def _column_tasks(
+        self,
+        action_type: str,
+        params: Dict[str, Any],
+        columns: Optional[List[int]] = None,
+        header_only: Iterable[int] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        Describe a column action as independent per-column transforms, each
+        carrying the column values it reads (and the cells to write back).
+        columns and header_only, if given, are already resolved (see
+        scheduler.resolve_columns).
+        """
         sheet_name = params.get("sheet") or self.workbook.sheetnames[0]
         sheet = self.workbook[sheet_name]
         
-        for row in sheet.iter_rows():
-            for cell in row:
-                if isinstance(cell.value, str):
-                    # Trim and clean
-                    cleaned = cell.value.strip()
-                    cleaned = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', cleaned)
-                    cell.value = cleaned
+        if action_type == "trim_clean":
+            # Header row included: padded headers are cleaned too
+            min_row, func, kwargs = 1, column_transforms.clean_text, {}
+        elif action_type == "standardize_phone":
+            min_row, func = 2, column_transforms.standardize_phone
+            kwargs = {"country_code": params.get("country_code", "234")}
+        elif action_type == "convert_dates":
+            min_row, func, kwargs = 2, column_transforms.convert_dates, {}
+        else:
+            raise ValueError(f"Not a column action: {action_type}")
+        
+        if columns is None:
+            header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            columns, header_only = resolve_columns(action_type, params, list(header_row))
+        header_only = set(header_only)
+        
+        tasks = []
+        for column in columns:
+            # exclude_columns: only the header cell is cleaned
+            max_row = 1 if column in header_only else sheet.max_row
+            if max_row < min_row:
+                cells = ()
+            else:
+                cells = next(sheet.iter_cols(
+                    min_row=min_row, max_row=max_row, min_col=column, max_col=column,
+                ))
+            tasks.append({
+                "sheet": sheet_name,
+                "column": column,
+                "min_row": min_row,
+                "cells": cells,
+                "values": [cell.value for cell in cells],
+                "func": func,
+                "kwargs": kwargs,
+            })
+        return tasks
+    
+    def _apply_column_results(
+        self,
+        action_type: str,
+        params: Dict[str, Any],
+        tasks: List[Dict[str, Any]],
+        outputs: List[Any],
+    ):
+        """Write transformed column values back and record the changes"""
+        sheet_name = params.get("sheet") or self.workbook.sheetnames[0]
+        sheet = self.workbook[sheet_name]
         
-        self.changes_log.append(f"Cleaned text in sheet: {sheet_name}")
+        for task, (new_values, stats) in zip(tasks, outputs):
+            column, min_row = task["column"], task["min_row"]
+            changed = [
+                offset
+                for offset, (old, new) in enumerate(zip(task["values"], new_values))
+                if new != old or type(new) is not type(old)
+            ]
+            for offset in changed:
+                task["cells"][offset].value = new_values[offset]
+            self.change_set.record_column(
+                sheet_name,
+                column,
+                [min_row + offset for offset in changed],
+                [task["values"][offset] for offset in changed],
+                [new_values[offset] for offset in changed],
+                self._action_id,
+            )
+            
+            if action_type == "standardize_phone":
+                key = f"{sheet_name}!{params.get('phone_col', 'Phone')}"
+                self.validation[key] = {
+                    name: stats[name] for name in ("valid", "invalid", "blank")
+                }
+                if params.get("highlight_invalid") and stats["invalid_rows"]:
+                    self.styles.highlight(
+                        sheet, ((min_row + i, column) for i in stats["invalid_rows"]), INVALID
+                    )
+            elif action_type == "convert_dates":
+                self.styles.apply_number_format(
+                    sheet, column, (min_row + i for i in stats["converted"]), DATE
+                )
+        
+        if action_type == "trim_clean":
+            self.changes_log.append(f"Cleaned text in sheet: {sheet_name}")
+        elif action_type == "standardize_phone":
+            invalid = sum(stats["invalid"] for _, stats in outputs)
+            self.changes_log.append(
+                f"Standardized phone numbers in column: {params.get('phone_col', 'Phone')}"
+                + (f" ({invalid} invalid left unchanged)" if invalid else "")
+            )
+        elif action_type == "convert_dates":
+            self.changes_log.append(f"Converted dates in column: {params.get('date_col', 'Date')}")
+    
+    def _run_column_action(self, action_type: str, params: Dict[str, Any]):
+        tasks = self._column_tasks(action_type, params)
+        outputs = [task["func"](task["values"], **task["kwargs"]) for task in tasks]
+        self._apply_column_results(action_type, params, tasks, outputs)
+    
+    def _trim_clean(self, params: Dict[str, Any]):
+        """Remove leading/trailing spaces and clean non-printable characters"""
+        self._run_column_action("trim_clean", params)
     
     def _remove_duplicates(self, params: Dict[str, Any]):
         """Remove duplicate rows"""
+        import pandas as pd
+        
         sheet_name = params.get("sheet") or self.workbook.sheetnames[0]
         sheet = self.workbook[sheet_name]
         
@@ -93,6 +307,14 @@ class ExcelProcessor:
         df = df.drop_duplicates(keep='first')
         removed_count = original_count - len(df)
         
+        # Data row i lives on sheet row i + 2 (header is row 1)
+        kept = set(df.index)
+        self.change_set.record_deleted_rows(
+            sheet_name,
+            (i + 2 for i in range(original_count) if i not in kept),
+            self._action_id,
+        )
+        
         # Clear sheet and write back
         sheet.delete_rows(2, sheet.max_row)
         for r_idx, row in enumerate(df.values, start=2):
@@ -121,6 +343,7 @@ class ExcelProcessor:
         last_col = sheet.max_column
         for i, new_col_name in enumerate(into):
             sheet.cell(row=1, column=last_col + i + 1, value=new_col_name)
+            self.change_set.record(sheet_name, 1, last_col + i + 1, None, new_col_name, self._action_id)
         
         # Split data
         for row_idx in range(2, sheet.max_row + 1):
@@ -129,11 +352,16 @@ class ExcelProcessor:
                 parts = cell_value.split(delimiter)
                 for i, part in enumerate(parts[:len(into)]):
                     sheet.cell(row=row_idx, column=last_col + i + 1, value=part.strip())
+                    self.change_set.record(
+                        sheet_name, row_idx, last_col + i + 1, None, part.strip(), self._action_id
+                    )
         
         self.changes_log.append(f"Split column '{source_col}' into {len(into)} columns")
     
     def _create_pivot(self, params: Dict[str, Any]):
         """Create a pivot table summary (simplified version)"""
+        import pandas as pd
+        
         sheet_name = params.get("sheet") or self.workbook.sheetnames[0]
         sheet = self.workbook[sheet_name]
         
@@ -157,85 +385,50 @@ class ExcelProcessor:
             
             # Create new sheet for pivot
             pivot_sheet_name = params.get("destination", "Pivot_Summary")
+            
+            # Remember what a replaced sheet held so the diff shows it
+            previous = {}
             if pivot_sheet_name in self.workbook.sheetnames:
+                for row_cells in self.workbook[pivot_sheet_name].iter_rows():
+                    for cell in row_cells:
+                        if cell.value is not None:
+                            previous[(cell.row, cell.column)] = cell.value
                 del self.workbook[pivot_sheet_name]
             
             pivot_sheet = self.workbook.create_sheet(pivot_sheet_name)
             
+            def write(row_idx, col_idx, value):
+                pivot_sheet.cell(row=row_idx, column=col_idx, value=value)
+                self.change_set.record(
+                    pivot_sheet_name, row_idx, col_idx,
+                    previous.pop((row_idx, col_idx), None), value, self._action_id
+                )
+            
             # Write pivot to new sheet
             # Headers
-            pivot_sheet.cell(row=1, column=1, value=rows[0])
+            write(1, 1, rows[0])
             for i, col in enumerate(pivot.columns):
-                pivot_sheet.cell(row=1, column=i + 2, value=str(col))
+                write(1, i + 2, str(col))
             
             # Data
             for r_idx, (idx, row) in enumerate(pivot.iterrows(), start=2):
-                pivot_sheet.cell(row=r_idx, column=1, value=str(idx))
+                write(r_idx, 1, str(idx))
                 for c_idx, value in enumerate(row.values, start=2):
-                    pivot_sheet.cell(row=r_idx, column=c_idx, value=value)
+                    write(r_idx, c_idx, value)
+            
+            # Cells of the replaced sheet that the pivot did not overwrite
+            for (row_idx, col_idx), old in sorted(previous.items()):
+                self.change_set.record(pivot_sheet_name, row_idx, col_idx, old, None, self._action_id)
             
             self.changes_log.append(f"Created pivot table in sheet: {pivot_sheet_name}")
     
     def _standardize_phone(self, params: Dict[str, Any]):
         """Standardize phone number format"""
-        sheet_name = params.get("sheet") or self.workbook.sheetnames[0]
-        phone_col = params.get("phone_col", "Phone")
-        country_code = params.get("country_code", "234")
-        
-        sheet = self.workbook[sheet_name]
-        
-        # Find phone column
-        header_row = list(sheet.iter_rows(min_row=1, max_row=1, values_only=True))[0]
-        try:
-            col_idx = header_row.index(phone_col) + 1
-        except ValueError:
-            raise ValueError(f"Column '{phone_col}' not found")
-        
-        # Standardize format
-        for row_idx in range(2, sheet.max_row + 1):
-            cell_value = sheet.cell(row=row_idx, column=col_idx).value
-            if cell_value:
-                # Remove all non-digits
-                digits = re.sub(r'\D', '', str(cell_value))
-                
-                # Add country code if missing
-                if not digits.startswith(country_code):
-                    digits = country_code + digits[-10:]
-                
-                # Format: +234-XXX-XXX-XXXX
-                if len(digits) >= 10:
-                    formatted = f"+{digits[:3]}-{digits[3:6]}-{digits[6:9]}-{digits[9:]}"
-                    sheet.cell(row=row_idx, column=col_idx, value=formatted)
-        
-        self.changes_log.append(f"Standardized phone numbers in column: {phone_col}")
+        self._run_column_action("standardize_phone", params)
     
     def _convert_dates(self, params: Dict[str, Any]):
         """Convert and standardize date formats"""
-        sheet_name = params.get("sheet") or self.workbook.sheetnames[0]
-        date_col = params.get("date_col", "Date")
-        
-        sheet = self.workbook[sheet_name]
-        
-        # Find date column
-        header_row = list(sheet.iter_rows(min_row=1, max_row=1, values_only=True))[0]
-        try:
-            col_idx = header_row.index(date_col) + 1
-        except ValueError:
-            raise ValueError(f"Column '{date_col}' not found")
-        
-        # Try to parse and standardize dates
-        for row_idx in range(2, sheet.max_row + 1):
-            cell = sheet.cell(row=row_idx, column=col_idx)
-            if cell.value:
-                try:
-                    # Try pandas date parsing
-                    date_val = pd.to_datetime(cell.value)
-                    cell.value = date_val.date()
-                    cell.number_format = 'YYYY-MM-DD'
-                except:
-                    pass  # Keep original if parsing fails
-        
-        self.changes_log.append(f"Converted dates in column: {date_col}")
+        self._run_column_action("convert_dates", params)
     
     def _add_calculated_column(self, params: Dict[str, Any]):
         """Add a new column with calculated values"""
@@ -248,14 +441,46 @@ class ExcelProcessor:
         # Add header
         last_col = sheet.max_column + 1
         sheet.cell(row=1, column=last_col, value=column_name)
+        self.change_set.record(sheet_name, 1, last_col, None, column_name, self._action_id)
         
         # Add formula to each row
         for row_idx in range(2, sheet.max_row + 1):
             formula = formula_template.replace("{ROW}", str(row_idx))
             sheet.cell(row=row_idx, column=last_col, value=formula)
+            self.change_set.record(sheet_name, row_idx, last_col, None, formula, self._action_id)
         
         self.changes_log.append(f"Added calculated column: {column_name}")
     
+    def highlight_changes(self, kind: str = CHANGED) -> int:
+        """
+        Highlight every cell edited so far using one conditional-formatting
+        rule per sheet. Returns the number of highlighted ranges.
+        """
+        cells_by_sheet: Dict[str, List] = {}
+        for sheet_name, row, column in self.change_set.current_cells():
+            cells_by_sheet.setdefault(sheet_name, []).append((row, column))
+        
+        ranges = 0
+        for sheet_name, cells in cells_by_sheet.items():
+            if sheet_name in self.workbook.sheetnames:
+                ranges += self.styles.highlight(self.workbook[sheet_name], cells, kind)
+        
+        return ranges
+    
+    def profile(
+        self,
+        sheet_name: Optional[str] = None,
+        sample_size: Optional[int] = None,
+        top_k: int = 10,
+        max_rows: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Compute per-column data-quality statistics for a sheet"""
+        sheet_name = sheet_name or self.workbook.sheetnames[0]
+        sheet = self.workbook[sheet_name]
+        
+        profiler = DataProfiler(sample_size=sample_size, top_k=top_k, max_rows=max_rows)
+        return profiler.profile_sheet(sheet)
+    
     def save(self, output_path: str):
         """Save the modified workbook"""
         self.workbook.save(output_path)
@@ -265,7 +490,10 @@ class ExcelProcessor:
         return {
             "changes": self.changes_log,
             "sheets": self.workbook.sheetnames,
-            "total_changes": len(self.changes_log)
+            "total_changes": len(self.changes_log),
+            "cells_changed": len(self.change_set),
+            "rows_deleted": self.change_set.deleted_row_count(),
+            "validation": self.validation,
         }
 
 
@@ -337,5 +565,58 @@ class ActionPlanner:
                 }
             })
         
+        return ActionPlanner._exclude_targeted_columns(plan)
+    
+    @staticmethod
+    def _exclude_targeted_columns(plan: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        A trim_clean over all text leaves out the data rows of columns that
+        later phone/date actions rewrite themselves, so the scheduler can run
+        those actions alongside the trim instead of after it
+        """
+        for i, action in enumerate(plan):
+            if action["type"] != "trim_clean" or action["params"].get("columns"):
+                continue
+            targeted = [
+                later["params"].get("phone_col", "Phone") if later["type"] == "standardize_phone"
+                else later["params"].get("date_col", "Date")
+                for later in plan[i + 1:]
+                if later["type"] in ("standardize_phone", "convert_dates")
+            ]
+            if targeted:
+                action["params"]["exclude_columns"] = targeted
         return plan
-
+    
+    @staticmethod
+    def suggest_from_profile(profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Suggest an action plan from data-quality signals produced by
+        ExcelProcessor.profile()
+        """
+        plan = []
+        columns = profile.get("columns", [])
+        
+        if any(col["whitespace_rate"] > 0 for col in columns):
+            plan.append({
+                "type": "trim_clean",
+                "description": "Clean and trim text fields",
+                "params": {"applyToAllText": True}
+            })
+        
+        for col in columns:
+            # Dates first: they also have the digits-and-separators shape of phones
+            phone_like = col["inferred_type"] in ("text", "mixed") or "phone" in col["name"].lower()
+            if col["date_rate"] >= 0.5 and set(col["date_formats"]) - {"native"}:
+                plan.append({
+                    "type": "convert_dates",
+                    "description": f"Convert and standardize dates in {col['name']}",
+                    "params": {"date_col": col["name"]}
+                })
+            elif col["phone_rate"] >= 0.5 and phone_like:
+                plan.append({
+                    "type": "standardize_phone",
+                    "description": f"Standardize phone number format in {col['name']}",
+                    "params": {"phone_col": col["name"]}
+                })
+        
+        return ActionPlanner._exclude_targeted_columns(plan)
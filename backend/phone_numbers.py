@@ -0,0 +1,282 @@
+"""
+Phone Number Normalization
+Table-driven normalization to +CC-XXX-XXX-XXXX style numbers without
+regular expressions: digits are extracted with str/bytes.translate and
+validated against precompiled per-country rules
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# country code -> valid national number lengths, trunk prefix, digit grouping.
+# "reject_leading" lists digits a national number cannot start with (default "0");
+# "prefix_groups" overrides the grouping for numbers starting with given digits.
+COUNTRY_RULES: Dict[str, Dict[str, Any]] = {
+    "1": {"lengths": (10,), "trunk": "1", "groups": (3, 3, 4), "reject_leading": "01"},  # US, Canada (NANP)
+    "7": {"lengths": (10,), "trunk": "8", "groups": (3, 3, 2, 2)},    # Russia, Kazakhstan
+    "20": {"lengths": (10,), "trunk": "0", "groups": (3, 3, 4)},      # Egypt
+    "27": {"lengths": (9,), "trunk": "0", "groups": (2, 3, 4)},       # South Africa
+    "33": {"lengths": (9,), "trunk": "0", "groups": (1, 2, 2, 2, 2)}, # France
+    "34": {"lengths": (9,), "trunk": "", "groups": (3, 3, 3)},        # Spain
+    "39": {"lengths": (9, 10, 11), "trunk": "", "groups": (3, 3), "reject_leading": ""},  # Italy
+    "44": {                                                           # United Kingdom
+        "lengths": (10,), "trunk": "0", "groups": (4, 6),             # 1xxx area codes, mobiles
+        "prefix_groups": {
+            "2": (2, 4, 4),                                           # London, Cardiff, ...
+            "3": (3, 3, 4), "8": (3, 3, 4), "9": (3, 3, 4),           # Non-geographic
+            **{code: (3, 3, 4) for code in ("113", "114", "115", "116", "117", "118",
+                                            "121", "131", "141", "151", "161", "191")},
+        },
+    },
+    "49": {"lengths": (10, 11), "trunk": "0", "groups": (3, 4)},      # Germany
+    "52": {"lengths": (10,), "trunk": "", "groups": (3, 3, 4)},       # Mexico
+    "55": {"lengths": (10, 11), "trunk": "0", "groups": (2, 5)},      # Brazil
+    "61": {"lengths": (9,), "trunk": "0", "groups": (1, 4, 4)},       # Australia
+    "62": {"lengths": (9, 10, 11, 12), "trunk": "0", "groups": (3, 4)},  # Indonesia
+    "63": {"lengths": (10,), "trunk": "0", "groups": (3, 3, 4)},      # Philippines
+    "81": {"lengths": (10,), "trunk": "0", "groups": (2, 4, 4)},      # Japan
+    "86": {"lengths": (11,), "trunk": "0", "groups": (3, 4, 4)},      # China
+    "91": {"lengths": (10,), "trunk": "0", "groups": (5, 5)},         # India
+    "233": {"lengths": (9,), "trunk": "0", "groups": (2, 3, 4)},      # Ghana
+    "234": {"lengths": (10,), "trunk": "0", "groups": (3, 3, 4)},     # Nigeria
+    "254": {"lengths": (9,), "trunk": "0", "groups": (3, 3, 3)},      # Kenya
+    "255": {"lengths": (9,), "trunk": "0", "groups": (3, 3, 3)},      # Tanzania
+    "256": {"lengths": (9,), "trunk": "0", "groups": (3, 3, 3)},      # Uganda
+    "966": {"lengths": (9,), "trunk": "0", "groups": (2, 3, 4)},      # Saudi Arabia
+    "971": {"lengths": (9,), "trunk": "0", "groups": (2, 3, 4)},      # United Arab Emirates
+}
+
+# Every assigned ITU-T E.164 country calling code. Codes are prefix-free,
+# so this is enough to split "+CC..." even when CC has no COUNTRY_RULES entry.
+COUNTRY_CODES = frozenset("""
+    1 7
+    20 211 212 213 216 218 220 221 222 223 224 225 226 227 228 229
+    230 231 232 233 234 235 236 237 238 239 240 241 242 243 244 245 246 247 248 249
+    250 251 252 253 254 255 256 257 258 260 261 262 263 264 265 266 267 268 269
+    27 290 291 297 298 299
+    30 31 32 33 34 350 351 352 353 354 355 356 357 358 359 36
+    370 371 372 373 374 375 376 377 378 379 380 381 382 383 385 386 387 389 39
+    40 41 420 421 423 43 44 45 46 47 48 49
+    500 501 502 503 504 505 506 507 508 509 51 52 53 54 55 56 57 58
+    590 591 592 593 594 595 596 597 598 599
+    60 61 62 63 64 65 66
+    670 672 673 674 675 676 677 678 679 680 681 682 683 685 686 687 688 689 690 691 692
+    800 808 81 82 84 850 852 853 855 856 86 870 878 880 881 882 883 886 888
+    90 91 92 93 94 95 960 961 962 963 964 965 966 967 968 970 971 972 973 974 975
+    976 977 979 98 992 993 994 995 996 998
+""".split())
+
+INTERNATIONAL_PREFIX = "00"
+
+# Any valid E.164 number has 7 to 15 digits including its country code
+E164_MIN_DIGITS = 7
+E164_MAX_DIGITS = 15
+
+
+def generic_rule(code: str) -> Dict[str, Any]:
+    """Ungrouped E.164 rule for a country code with no COUNTRY_RULES entry"""
+    return {
+        "lengths": tuple(range(max(1, E164_MIN_DIGITS - len(code)), E164_MAX_DIGITS - len(code) + 1)),
+        "trunk": "0",
+        "groups": (),
+    }
+
+# bytes.translate deletes every non-digit byte in one C-level pass
+_ASCII_NON_DIGITS = bytes(b for b in range(128) if not 48 <= b <= 57)
+
+
+class _DigitTable(dict):
+    """str.translate table: Unicode decimal digits -> ASCII, everything else dropped"""
+
+    def __missing__(self, codepoint: int) -> Optional[str]:
+        digit = unicodedata.decimal(chr(codepoint), None)
+        mapped = None if digit is None else str(digit)
+        self[codepoint] = mapped
+        return mapped
+
+
+_UNICODE_DIGITS = _DigitTable()
+
+
+def extract_digits(text: str) -> str:
+    """Return only the decimal digits of text, as ASCII"""
+    if text.isascii():
+        return text.encode("ascii").translate(None, _ASCII_NON_DIGITS).decode("ascii")
+    return text.translate(_UNICODE_DIGITS)
+
+
+class _Rule:
+    """Precompiled form of a COUNTRY_RULES entry"""
+
+    __slots__ = ("code", "lengths", "trunk", "reject_leading", "prefix", "slices", "prefix_slices")
+
+    def __init__(self, code: str, spec: Dict[str, Any]):
+        self.code = code
+        self.lengths = frozenset(spec["lengths"])
+        self.trunk = spec["trunk"]
+        self.reject_leading = frozenset(spec.get("reject_leading", "0"))
+        self.prefix = f"+{code}-"
+        self.slices = self._compile(spec["groups"])
+        # Longest leading digits first, so "121" wins over "1"
+        self.prefix_slices = tuple(
+            (digits, self._compile(groups))
+            for digits, groups in sorted(
+                spec.get("prefix_groups", {}).items(), key=lambda item: -len(item[0])
+            )
+        )
+
+    def _compile(self, groups: Tuple[int, ...]) -> Dict[int, Tuple[slice, ...]]:
+        """Group boundaries per valid length; leftover digits form a last group"""
+        slices = {}
+        for length in self.lengths:
+            bounds = []
+            pos = 0
+            for size in groups:
+                if pos >= length:
+                    break
+                bounds.append(slice(pos, min(pos + size, length)))
+                pos += size
+            if pos < length:
+                bounds.append(slice(pos, length))
+            slices[length] = tuple(bounds)
+        return slices
+
+    def accepts(self, national: str) -> bool:
+        return len(national) in self.lengths and national[0] not in self.reject_leading
+
+    def format(self, national: str) -> str:
+        slices = self.slices
+        for digits, prefixed in self.prefix_slices:
+            if national.startswith(digits):
+                slices = prefixed
+                break
+        return self.prefix + "-".join(map(national.__getitem__, slices[len(national)]))
+
+
+class PhoneNormalizer:
+    """
+    Normalize phone numbers for one default country.
+
+    Numbers written with "+" or "00" are matched against every country in the
+    rule table; other numbers are read as national numbers of the default
+    country (with or without its trunk prefix, or with its country code but
+    no "+"). A country code missing from the rule table, as the default or
+    after "+"/"00", gets the generic E.164 rule. Results are cached, so repeated values cost a dict lookup.
+    """
+
+    def __init__(
+        self,
+        default_country: str = "234",
+        rules: Optional[Dict[str, Dict[str, Any]]] = None,
+        cache_size: int = 65536,
+    ):
+        rules = COUNTRY_RULES if rules is None else rules
+        self._rules = {code: _Rule(code, spec) for code, spec in rules.items()}
+        if default_country not in self._rules:
+            if not default_country.isdigit():
+                raise ValueError(f"Invalid country code '{default_country}'")
+            self._rules[default_country] = _Rule(default_country, generic_rule(default_country))
+        self.default = self._rules[default_country]
+        # Digit count -> (required prefix, digits to strip) candidates for
+        # numbers written without an international prefix
+        self._national_plan: Dict[int, List[Tuple[str, int]]] = {}
+        for prefix in ("", self.default.trunk, self.default.code):
+            for length in self.default.lengths:
+                candidates = self._national_plan.setdefault(length + len(prefix), [])
+                if (prefix, len(prefix)) not in candidates:
+                    candidates.append((prefix, len(prefix)))
+        self._code_lengths = sorted({len(code) for code in self._rules} | {len(code) for code in COUNTRY_CODES})
+        self.normalize_text = lru_cache(maxsize=cache_size)(self._normalize_text)
+
+    def normalize(self, value: Any) -> Optional[str]:
+        """Return the formatted number, or None if value is not a valid phone number"""
+        if type(value) is str:
+            return self.normalize_text(value)
+        if value is None or isinstance(value, bool):
+            return None
+        if isinstance(value, float):
+            if not value.is_integer():
+                return None
+            value = int(value)
+        return self.normalize_text(str(value))
+
+    def _normalize_text(self, text: str) -> Optional[str]:
+        # Inlined extract_digits: this is the per-value hot path
+        if text.isascii():
+            digits = text.encode("ascii").translate(None, _ASCII_NON_DIGITS).decode("ascii")
+        else:
+            digits = text.translate(_UNICODE_DIGITS)
+        if not digits:
+            return None
+
+        if "+" in text and text.lstrip().startswith("+"):
+            return self._international(digits)
+        if digits.startswith(INTERNATIONAL_PREFIX):
+            return self._international(digits[len(INTERNATIONAL_PREFIX):])
+
+        rule = self.default
+        for prefix, strip in self._national_plan.get(len(digits), ()):
+            if digits.startswith(prefix) and digits[strip] not in rule.reject_leading:
+                return rule.format(digits[strip:])
+        return None
+
+    def _international(self, digits: str) -> Optional[str]:
+        for size in self._code_lengths:
+            code = digits[:size]
+            rule = self._rules.get(code)
+            if not rule:
+                if code not in COUNTRY_CODES:
+                    continue
+                # Assigned code without a specific rule: ungrouped E.164
+                rule = self._rules[code] = _Rule(code, generic_rule(code))
+            national = digits[size:]
+            # Tolerate a trunk prefix after the country code, e.g. +44 (0)20 ...
+            if rule.trunk and national.startswith(rule.trunk) and rule.accepts(national[len(rule.trunk):]):
+                national = national[len(rule.trunk):]
+            if rule.accepts(national):
+                return rule.format(national)
+        return None
+
+    def normalize_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[str, Any]]:
+        """
+        Normalize a column of values. Invalid values are returned unchanged;
+        stats holds valid/invalid/blank counts and the invalid positions.
+        """
+        normalized = []
+        invalid_rows = []
+        blank = 0
+        normalize_text = self.normalize_text
+        normalize = self.normalize
+
+        for i, value in enumerate(values):
+            if type(value) is str:
+                result = normalize_text(value)
+            elif value is None:
+                result = None
+            else:
+                result = normalize(value)
+
+            if result is not None:
+                normalized.append(result)
+                continue
+            # Rare path: tell blanks apart from invalid numbers
+            if value is None or (type(value) is str and not value.strip()):
+                blank += 1
+            else:
+                invalid_rows.append(i)
+            normalized.append(value)
+
+        return normalized, {
+            "valid": len(values) - blank - len(invalid_rows),
+            "invalid": len(invalid_rows),
+            "blank": blank,
+            "invalid_rows": invalid_rows,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_normalizer(default_country: str = "234") -> PhoneNormalizer:
+    """Shared normalizer per default country, so its cache survives across calls"""
+    return PhoneNormalizer(default_country)
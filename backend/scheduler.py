@@ -0,0 +1,147 @@
+"""
+Plan Scheduler
+Works out which columns each action reads and writes, and groups
+consecutive non-conflicting actions into waves that may run concurrently
+"""
+
+from typing import List, Dict, Any, Optional, Set, Tuple
+from column_transforms import clean_text
+
+
+ALL_COLUMNS = "*"
+
+# Actions that only rewrite values inside existing columns
+COLUMN_ACTIONS = {"trim_clean", "standardize_phone", "convert_dates"}
+
+
+def _barrier(sheet: str) -> Dict[str, Any]:
+    return {
+        "sheet": sheet, "reads": {ALL_COLUMNS}, "writes": {ALL_COLUMNS},
+        "barrier": True, "columns": None, "header_only": (),
+    }
+
+
+def _column_names(action_type: str, params: Dict[str, Any]) -> Optional[List[str]]:
+    """Header names an action looks up (None: trim_clean over every column)"""
+    if action_type == "trim_clean":
+        return params.get("columns") or None
+    if action_type == "standardize_phone":
+        return [params.get("phone_col", "Phone")]
+    return [params.get("date_col", "Date")]
+
+
+def resolve_columns(
+    action_type: str, params: Dict[str, Any], header: List[Any]
+) -> Tuple[List[int], List[int]]:
+    """
+    Return the 1-based columns a column action touches and, for trim_clean,
+    those of them listed in exclude_columns, whose header cell is cleaned
+    but whose data rows are left alone. Raises ValueError for an unknown
+    column name.
+    """
+    names = _column_names(action_type, params)
+    if names is None:
+        columns = list(range(1, len(header) + 1))
+    else:
+        columns = []
+        for name in names:
+            if name not in header:
+                raise ValueError(f"Column '{name}' not found")
+            columns.append(header.index(name) + 1)
+
+    header_only = []
+    if action_type == "trim_clean":
+        excluded = set(params.get("exclude_columns") or ())
+        header_only = [column for column in columns if header[column - 1] in excluded]
+    return columns, header_only
+
+
+def action_footprint(
+    action: Dict[str, Any],
+    default_sheet: str,
+    headers: Dict[str, List[Any]],
+) -> Dict[str, Any]:
+    """
+    Return the sheet, read set and write set of an action, given the current
+    header row of each sheet. Actions that add or remove rows, columns or
+    sheets are barriers and never share a wave.
+
+    Column names are resolved to 1-based indexes ("columns" lists them), so
+    two names for the same column, e.g. "Phone " before and "Phone" after a
+    trim_clean, are seen to overlap. Header cells that trim_clean cleans are
+    tracked apart from data rows. An action whose column cannot be found is
+    a barrier, so it runs alone and fails as it would serially.
+    """
+    action_type = action.get("type")
+    params = action.get("params", {})
+    sheet = params.get("sheet") or default_sheet
+
+    header = headers.get(sheet)
+    if action_type not in COLUMN_ACTIONS or header is None:
+        return _barrier(sheet)
+    try:
+        columns, header_only = resolve_columns(action_type, params, header)
+    except ValueError:
+        return _barrier(sheet)
+
+    touched: Set[Any] = set(columns) - set(header_only)
+    if action_type == "trim_clean":
+        touched |= {("header", column) for column in columns}
+    return {
+        "sheet": sheet, "reads": touched, "writes": touched,
+        "barrier": False, "columns": columns, "header_only": header_only,
+    }
+
+
+def _overlaps(a: Set[Any], b: Set[Any]) -> bool:
+    if not a or not b:
+        return False
+    return ALL_COLUMNS in a or ALL_COLUMNS in b or not a.isdisjoint(b)
+
+
+def conflicts(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """True if two footprints must run in plan order"""
+    if a["barrier"] or b["barrier"]:
+        return True
+    if a["sheet"] != b["sheet"]:
+        return False
+    return (
+        _overlaps(a["writes"], b["reads"])
+        or _overlaps(a["reads"], b["writes"])
+        or _overlaps(a["writes"], b["writes"])
+    )
+
+
+def next_wave(
+    plan: List[Dict[str, Any]],
+    start: int,
+    default_sheet: str,
+    headers: Dict[str, List[Any]],
+) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Return (action index, footprint) pairs for the wave starting at
+    plan[start]. Actions in a wave touch disjoint data, so running them
+    concurrently gives the same result as running them in plan order.
+
+    headers should be the sheets' header rows as they are when the wave
+    starts. trim_clean also cleans row 1, so its header edits are replayed
+    before later actions in the wave look up their columns.
+    """
+    headers = {sheet: list(header) for sheet, header in headers.items()}
+
+    wave: List[Tuple[int, Dict[str, Any]]] = []
+    for index in range(start, len(plan)):
+        action = plan[index]
+        footprint = action_footprint(action, default_sheet, headers)
+        if wave and any(conflicts(footprint, other) for _, other in wave):
+            break
+        wave.append((index, footprint))
+        if footprint["barrier"]:
+            break
+        if action.get("type") == "trim_clean":
+            header = headers[footprint["sheet"]]
+            cleaned, _ = clean_text([header[column - 1] for column in footprint["columns"]])
+            for column, value in zip(footprint["columns"], cleaned):
+                header[column - 1] = value
+
+    return wave
@@ -0,0 +1,70 @@
+"""
+Production Launcher
+Runs the processing API with several uvicorn worker processes
+
+Usage:
+    EXCELAI_STORAGE=sqlite EXCELAI_DATA_DIR=/srv/excelai python serve.py --workers 4
+"""
+
+import argparse
+import os
+import uvicorn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ExcelAI processing API")
+    parser.add_argument("--host", default=os.environ.get("EXCELAI_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("EXCELAI_PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("EXCELAI_WORKERS", os.cpu_count() or 1)),
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=["local", "sqlite"],
+        default=os.environ.get("EXCELAI_STORAGE"),
+        help="Storage backend shared by all workers",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=os.environ.get("EXCELAI_DATA_DIR"),
+        help="Directory (or shared volume) holding uploads, outputs and job state",
+    )
+    parser.add_argument(
+        "--forwarded-allow-ips",
+        default=os.environ.get("EXCELAI_FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        help="Comma-separated proxy addresses whose X-Forwarded-* headers are trusted",
+    )
+    parser.add_argument(
+        "--no-prewarm",
+        action="store_true",
+        help="Skip importing pandas/openpyxl in each worker before it accepts requests",
+    )
+    args = parser.parse_args()
+
+    # Workers are separate processes and read their config from the environment
+    if args.workers > 1 and not args.storage:
+        args.storage = "sqlite"
+    if args.storage:
+        os.environ["EXCELAI_STORAGE"] = args.storage
+    if args.data_dir:
+        os.environ["EXCELAI_DATA_DIR"] = os.path.abspath(args.data_dir)
+    if args.no_prewarm:
+        os.environ["EXCELAI_PREWARM"] = "0"
+    else:
+        os.environ.setdefault("EXCELAI_PREWARM", "1")
+
+    uvicorn.run(
+        "api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        proxy_headers=True,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+    )
+
+
+if __name__ == "__main__":
+    main()
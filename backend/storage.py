@@ -0,0 +1,229 @@
+"""
+File and Job State Storage
+Abstracts where uploads, outputs and job records live so that several
+API workers (or nodes sharing a volume) see the same state
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Any, BinaryIO, Iterator, Optional
+
+
+class Storage(ABC):
+    """Interface for upload/output files and job records"""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.upload_dir = os.path.join(self.root, "uploads")
+        self.output_dir = os.path.join(self.root, "outputs")
+        os.makedirs(self.upload_dir, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    @abstractmethod
+    def save_upload(self, file_id: str, filename: str, fileobj: BinaryIO) -> str:
+        """Persist an uploaded file and return its path"""
+
+    @abstractmethod
+    def find_upload(self, file_id: str) -> Optional[str]:
+        """Return the path of an uploaded file, or None if unknown"""
+
+    @abstractmethod
+    def delete_upload(self, file_id: str):
+        """Remove an uploaded file"""
+
+    def output_path(self, job_id: str, suffix: str = "output.xlsx") -> str:
+        """Path where an artifact for a job is (or will be) stored"""
+        return os.path.join(self.output_dir, f"{job_id}_{suffix}")
+
+    @abstractmethod
+    def put_job(self, job_id: str, record: Dict[str, Any]):
+        """Create or replace the state record for a job"""
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch the state record for a job, or None if unknown"""
+
+    @abstractmethod
+    def cleanup(self, upload_ttl: float, output_ttl: float) -> int:
+        """Delete uploads/outputs older than the given ages (seconds)"""
+
+    @staticmethod
+    def _remove_expired(directory: str, ttl: float, now: float) -> int:
+        deleted = 0
+        for filename in os.listdir(directory):
+            path = os.path.join(directory, filename)
+            try:
+                if now - os.path.getctime(path) > ttl:
+                    os.remove(path)
+                    deleted += 1
+            except FileNotFoundError:
+                pass  # Another worker removed it first
+        return deleted
+
+
+class LocalStorage(Storage):
+    """
+    Plain filesystem storage. Uploads are located by scanning for their
+    file_id prefix and job records are JSON files next to the outputs.
+    Safe for several workers on one host as long as they share the root.
+    """
+
+    def save_upload(self, file_id: str, filename: str, fileobj: BinaryIO) -> str:
+        path = os.path.join(self.upload_dir, f"{file_id}_{os.path.basename(filename)}")
+        with open(path, "wb") as buffer:
+            shutil.copyfileobj(fileobj, buffer)
+        return path
+
+    def find_upload(self, file_id: str) -> Optional[str]:
+        for filename in os.listdir(self.upload_dir):
+            if filename.startswith(file_id):
+                return os.path.join(self.upload_dir, filename)
+        return None
+
+    def delete_upload(self, file_id: str):
+        path = self.find_upload(file_id)
+        if path:
+            os.remove(path)
+
+    def put_job(self, job_id: str, record: Dict[str, Any]):
+        path = self.output_path(job_id, "job.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, default=str)
+        # Atomic on POSIX, so readers never see a half-written record
+        os.replace(tmp_path, path)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        path = self.output_path(job_id, "job.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def cleanup(self, upload_ttl: float, output_ttl: float) -> int:
+        now = time.time()
+        return (
+            self._remove_expired(self.upload_dir, upload_ttl, now)
+            + self._remove_expired(self.output_dir, output_ttl, now)
+        )
+
+
+class SQLiteStorage(Storage):
+    """
+    Shared storage for multi-worker deployments. Files live under a shared
+    root and an SQLite index (WAL journal) maps ids to paths and holds job
+    records, so lookups are indexed and concurrent writers are serialized.
+
+    WAL requires all processes to run on the same host. When workers on
+    several nodes mount the root over a network filesystem, pass
+    journal_mode="DELETE".
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS uploads (
+            file_id TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            path TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            record TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, root: str, journal_mode: str = "WAL", timeout: float = 30.0):
+        super().__init__(root)
+        self.db_path = os.path.join(self.root, "excelai.db")
+        self.timeout = timeout
+        with self._connect() as conn:
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call: safe across threads and forks
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save_upload(self, file_id: str, filename: str, fileobj: BinaryIO) -> str:
+        path = os.path.join(self.upload_dir, f"{file_id}_{os.path.basename(filename)}")
+        with open(path, "wb") as buffer:
+            shutil.copyfileobj(fileobj, buffer)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads (file_id, filename, path, created_at) VALUES (?, ?, ?, ?)",
+                (file_id, filename, path, time.time()),
+            )
+        return path
+
+    def find_upload(self, file_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT path FROM uploads WHERE file_id = ?", (file_id,)).fetchone()
+        return row[0] if row else None
+
+    def delete_upload(self, file_id: str):
+        path = self.find_upload(file_id)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM uploads WHERE file_id = ?", (file_id,))
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def put_job(self, job_id: str, record: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, record, updated_at) VALUES (?, ?, ?)",
+                (job_id, json.dumps(record, default=str), time.time()),
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT record FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def cleanup(self, upload_ttl: float, output_ttl: float) -> int:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM uploads WHERE created_at < ?", (now - upload_ttl,))
+            conn.execute("DELETE FROM jobs WHERE updated_at < ?", (now - output_ttl,))
+        return (
+            self._remove_expired(self.upload_dir, upload_ttl, now)
+            + self._remove_expired(self.output_dir, output_ttl, now)
+        )
+
+
+STORAGE_BACKENDS = {
+    "local": LocalStorage,
+    "sqlite": SQLiteStorage,
+}
+
+
+def get_storage(backend: Optional[str] = None, root: Optional[str] = None) -> Storage:
+    """
+    Build the configured storage backend.
+    Reads EXCELAI_STORAGE (local|sqlite) and EXCELAI_DATA_DIR when not given.
+    """
+    backend = backend or os.environ.get("EXCELAI_STORAGE", "local")
+    root = root or os.environ.get("EXCELAI_DATA_DIR", ".")
+
+    try:
+        storage_class = STORAGE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage backend '{backend}'. Choose one of: {', '.join(STORAGE_BACKENDS)}"
+        )
+
+    if storage_class is SQLiteStorage:
+        return SQLiteStorage(root, journal_mode=os.environ.get("EXCELAI_SQLITE_JOURNAL", "WAL"))
+    return storage_class(root)
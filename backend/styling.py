@@ -0,0 +1,119 @@
+"""
+Bulk Styling
+Registers shared named styles once per workbook and applies formatting to
+whole ranges, or through conditional-formatting rules, instead of building
+a style per cell
+"""
+
+from itertools import groupby
+from typing import List, Dict, Any, Iterable, Tuple
+
+
+CHANGED = "changed"
+INVALID = "invalid"
+DATE = "date"
+
+# Named-style definitions: (fill colour, font colour, number format)
+STYLE_DEFINITIONS: Dict[str, Dict[str, Any]] = {
+    CHANGED: {"name": "ExcelAI Changed", "fill": "FFF2CC", "font": None, "number_format": None},
+    INVALID: {"name": "ExcelAI Invalid", "fill": "F8CBAD", "font": "9C0006", "number_format": None},
+    DATE: {"name": "ExcelAI Date", "fill": None, "font": None, "number_format": "YYYY-MM-DD"},
+}
+
+
+def rows_to_ranges(rows: Iterable[int]) -> List[Tuple[int, int]]:
+    """Collapse row numbers into sorted inclusive (start, end) runs"""
+    runs: List[Tuple[int, int]] = []
+    for row in sorted(set(rows)):
+        if runs and row == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
+def column_sqref(column: int, rows: Iterable[int]) -> str:
+    """Space-separated range list (e.g. "B2:B90 B95") covering rows of one column"""
+    from openpyxl.utils import get_column_letter
+
+    letter = get_column_letter(column)
+    return " ".join(
+        f"{letter}{start}" if start == end else f"{letter}{start}:{letter}{end}"
+        for start, end in rows_to_ranges(rows)
+    )
+
+
+class StyleRegistry:
+    """Shared named styles and bulk formatting helpers for one workbook"""
+
+    def __init__(self, workbook):
+        self.workbook = workbook
+
+    def register(self, kind: str) -> str:
+        """Add the named style for kind to the workbook once; return its name"""
+        from openpyxl.styles import NamedStyle, PatternFill, Font
+
+        spec = STYLE_DEFINITIONS[kind]
+        if spec["name"] in self.workbook.named_styles:
+            return spec["name"]
+
+        style = NamedStyle(name=spec["name"])
+        if spec["fill"]:
+            style.fill = PatternFill(start_color=spec["fill"], end_color=spec["fill"], fill_type="solid")
+        if spec["font"]:
+            style.font = Font(color=spec["font"])
+        if spec["number_format"]:
+            style.number_format = spec["number_format"]
+        self.workbook.add_named_style(style)
+        return spec["name"]
+
+    def apply_style(self, sheet, column: int, rows: Iterable[int], kind: str):
+        """
+        Point every cell of a column range at one shared named style. This
+        replaces the cells' font, fill and borders, so use it only for cells
+        the tool creates itself.
+        """
+        name = self.register(kind)
+        for start, end in rows_to_ranges(rows):
+            for (cell,) in sheet.iter_rows(min_row=start, max_row=end, min_col=column, max_col=column):
+                cell.style = name
+
+    def apply_number_format(self, sheet, column: int, rows: Iterable[int], kind: str):
+        """
+        Set the number format of kind on a column range of existing cells,
+        keeping their other styling. openpyxl shares identical style
+        combinations, so this does not add a style per cell.
+        """
+        number_format = STYLE_DEFINITIONS[kind]["number_format"]
+        for start, end in rows_to_ranges(rows):
+            for (cell,) in sheet.iter_rows(min_row=start, max_row=end, min_col=column, max_col=column):
+                cell.number_format = number_format
+
+    def highlight(self, sheet, cells: Iterable[Tuple[int, int]], kind: str = CHANGED) -> int:
+        """
+        Highlight (row, column) cells with a single always-true conditional
+        formatting rule. Only the rule and its range list are written to the
+        file, so cost grows with the number of contiguous runs, not cells.
+        Returns the number of ranges covered.
+        """
+        from openpyxl.formatting.rule import Rule
+        from openpyxl.styles import PatternFill, Font
+        from openpyxl.styles.differential import DifferentialStyle
+
+        by_column = sorted((column, row) for row, column in cells)
+        sqrefs = [
+            column_sqref(column, (row for _, row in group))
+            for column, group in groupby(by_column, key=lambda cr: cr[0])
+        ]
+        if not sqrefs:
+            return 0
+
+        spec = STYLE_DEFINITIONS[kind]
+        dxf = DifferentialStyle(
+            fill=PatternFill(bgColor=spec["fill"], fill_type="solid") if spec["fill"] else None,
+            font=Font(color=spec["font"]) if spec["font"] else None,
+        )
+        rule = Rule(type="expression", formula=["TRUE"], dxf=dxf, stopIfTrue=False)
+        sqref = " ".join(sqrefs)
+        sheet.conditional_formatting.add(sqref, rule)
+        return len(sqref.split())
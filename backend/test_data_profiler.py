@@ -0,0 +1,131 @@
+"""
+Tests for Data Profiler
+Run with: pytest test_data_profiler.py
+"""
+
+import pytest
+from datetime import datetime
+from data_profiler import DataProfiler, HyperLogLog, SpaceSaving, looks_like_phone
+from excel_processor import ExcelProcessor, ActionPlanner
+
+
+@pytest.fixture
+def profile_workbook(make_workbook):
+    """Create a workbook with typical data-quality issues"""
+    return make_workbook([
+        ["Name", "Phone", "Signup", "Amount"],
+        ["  Alice  ", "+234 803 123 4567", "2024-01-05", 10],
+        ["Bob", "(080) 312-34567", "05/01/2024", 25.5],
+        ["Carol", "08031234567", datetime(2024, 1, 7), None],
+        ["Bob", None, "2024-01-09", 40],
+    ], title="Contacts")
+
+
+class TestSketches:
+    """Test the streaming sketches"""
+    
+    def test_hyperloglog_estimate(self):
+        """Distinct estimate stays within a few percent"""
+        hll = HyperLogLog(precision=12)
+        for i in range(20000):
+            hll.add(f"value-{i % 5000}")
+        
+        assert abs(hll.count() - 5000) / 5000 < 0.05
+    
+    def test_space_saving_finds_heavy_hitters(self):
+        """Frequent values survive eviction"""
+        top = SpaceSaving(k=3)
+        for i in range(1000):
+            top.add("hot" if i % 2 == 0 else f"cold-{i}")
+        
+        value, count, error = top.top(1)[0]
+        assert value == "hot"
+        assert count - error <= 500 <= count
+
+    def test_space_saving_rejects_empty_capacity(self):
+        """k must leave room for at least one counter"""
+        with pytest.raises(ValueError):
+            SpaceSaving(k=0)
+
+
+class TestDataProfiler:
+    """Test column profiling"""
+    
+    def test_profile_sheet(self, profile_workbook):
+        """Test full-pass statistics on a worksheet"""
+        processor = ExcelProcessor(profile_workbook, read_only=True)
+        profile = processor.profile("Contacts")
+        columns = {col["name"]: col for col in profile["columns"]}
+        
+        assert profile["rows_scanned"] == 4
+        assert profile["sampled"] is False
+        
+        assert columns["Name"]["approx_distinct"] == 3
+        assert columns["Name"]["top_values"][0] == {"value": "Bob", "count": 2, "error": 0}
+        assert columns["Name"]["whitespace_rate"] == 0.25
+        
+        assert columns["Phone"]["null_rate"] == 0.25
+        assert columns["Phone"]["phone_rate"] == 1.0
+        
+        assert columns["Signup"]["inferred_type"] == "date"
+        assert columns["Signup"]["date_rate"] == 1.0
+        
+        assert columns["Amount"]["inferred_type"] == "number"
+        assert columns["Amount"]["min"] == 10.0
+        assert columns["Amount"]["max"] == 40.0
+    
+    def test_reservoir_sampling(self):
+        """Sample mode profiles a bounded number of rows"""
+        rows = ((i, f"name-{i}") for i in range(10000))
+        profile = DataProfiler(sample_size=100, seed=7).profile_rows(["Id", "Name"], rows)
+        
+        assert profile["rows_scanned"] == 10000
+        assert profile["rows_profiled"] == 100
+        assert profile["sampled"] is True
+        assert profile["columns"][0]["count"] == 100
+    
+    def test_max_rows_limits_scan(self):
+        """max_rows stops the pass early and reports truncation"""
+        rows = ((i,) for i in range(10000))
+        profile = DataProfiler(sample_size=50, max_rows=200, seed=7).profile_rows(["Id"], rows)
+        
+        assert profile["rows_scanned"] == 200
+        assert profile["rows_profiled"] == 50
+        assert profile["truncated"] is True
+        
+        profile = DataProfiler(max_rows=200).profile_rows(["Id"], [(1,), (2,)])
+        assert profile["truncated"] is False
+    
+    def test_dates_and_numbers_are_not_phones(self):
+        """Dates and numeric cells share the phone shape but are not phones"""
+        assert looks_like_phone("+234 803 123 4567")
+        assert not looks_like_phone("2024-01-05")
+        assert not looks_like_phone("05.01.2024")
+        assert not looks_like_phone(1234567)
+        
+        profile = DataProfiler().profile_rows(["Amount"], [(1234567,), (2345678,)])
+        assert profile["columns"][0]["phone_rate"] == 0.0
+    
+    def test_suggest_dates_before_phones(self):
+        """A mostly-date column is suggested for date conversion, not phones"""
+        profile = DataProfiler().profile_rows(
+            ["Date"], [("2024-01-05",), ("2024-02-10",), ("n/a",), ("n/a",)]
+        )
+        plan = ActionPlanner.suggest_from_profile(profile)
+        
+        assert [action["type"] for action in plan] == ["convert_dates"]
+        assert plan[0]["params"] == {"date_col": "Date"}
+    
+    def test_suggest_from_profile(self, profile_workbook):
+        """Test planner suggestions from profile signals"""
+        processor = ExcelProcessor(profile_workbook)
+        plan = ActionPlanner.suggest_from_profile(processor.profile())
+        action_types = [action["type"] for action in plan]
+        
+        assert "trim_clean" in action_types
+        assert "standardize_phone" in action_types
+        assert "convert_dates" in action_types
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
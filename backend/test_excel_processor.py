@@ -6,6 +6,7 @@ Run with: pytest test_excel_processor.py
 import pytest
 import openpyxl
 from excel_processor import ExcelProcessor, ActionPlanner
+from change_set import ChangeSet
 import os
 import tempfile
 
@@ -107,6 +108,86 @@ class TestExcelProcessor:
         
         assert "changes" in diff
         assert len(diff["changes"]) > 0
+    
+    def test_change_set_tracks_cells(self, sample_workbook):
+        """Test cell-level change tracking during a plan"""
+        processor = ExcelProcessor(sample_workbook)
+        
+        processor.execute_plan([
+            {"type": "trim_clean", "params": {}},
+            {"type": "remove_duplicates", "params": {}},
+        ])
+        diff = processor.change_set.to_dict()
+        changes = diff["changes"]
+        
+        # "  John Smith  " (rows 2 and 4) and "jane@test.com  " were trimmed
+        assert diff["total"] == 3
+        assert changes["row"][0] == 2
+        assert changes["column"][0] == 1
+        assert changes["old"][0] == "  John Smith  "
+        assert changes["new"][0] == "John Smith"
+        assert set(changes["action"]) == {0}
+        
+        assert diff["deleted_rows"] == [{"sheet": "TestData", "start": 4, "end": 4, "action": 1}]
+        assert processor.get_diff_summary()["rows_deleted"] == 1
+    
+    def test_change_set_roundtrip(self, sample_workbook, tmp_path):
+        """Test paginating a saved change set"""
+        processor = ExcelProcessor(sample_workbook)
+        processor._trim_clean({})
+        
+        path = str(tmp_path / "diff.json")
+        processor.change_set.save(path)
+        page = ChangeSet.read_page(path, offset=1, limit=1)
+        
+        # Edits are recorded column by column: A2, A4, then B3
+        assert page["total"] == 3
+        assert page["changes"]["row"] == [4]
+        assert page["changes"]["column"] == [1]
+        assert page["sheet_names"] == ["TestData"]
+
+    def test_change_set_read_page(self, tmp_path):
+        """Test reading pages that span chunk files"""
+        change_set = ChangeSet()
+        change_set.record_column("Data", 2, list(range(2, 9)), ["x"] * 7, ["y"] * 7)
+        change_set.record_deleted_rows("Data", [20, 22, 24, 26, 28], action_id=1)
+
+        path = str(tmp_path / "diff.json")
+        change_set.save(path, chunk_size=3)
+        page = ChangeSet.read_page(path, offset=2, limit=3, deleted_offset=3, deleted_limit=5)
+
+        assert page == change_set.to_dict(2, 3, 3, 5)
+        assert page["changes"]["row"] == [4, 5, 6]
+        assert page["deleted_total"] == 5
+        assert [r["start"] for r in page["deleted_rows"]] == [26, 28]
+        assert ChangeSet.read_page(path, offset=7, limit=3)["changes"]["row"] == []
+
+    def test_pivot_records_written_cells(self, make_workbook):
+        """Test pivot output (and what it replaced) is in the change set"""
+        path = make_workbook([
+            ["Region", "Sales"],
+            ["North", 10],
+            ["South", 5],
+            ["North", 7],
+        ], title="Data")
+        processor = ExcelProcessor(path)
+        processor.workbook.create_sheet("Pivot_Summary")["D9"] = "stale"
+
+        processor._create_pivot({"rows": ["Region"], "values": [{"field": "Sales", "agg": "sum"}]})
+        diff = processor.change_set.to_dict()
+        cells = {
+            (row, col): (old, new)
+            for row, col, old, new in zip(
+                diff["changes"]["row"], diff["changes"]["column"],
+                diff["changes"]["old"], diff["changes"]["new"],
+            )
+        }
+
+        assert diff["sheet_names"] == ["Pivot_Summary"]
+        assert cells[(1, 1)] == (None, "Region")
+        assert cells[(2, 1)] == (None, "North")
+        assert cells[(2, 2)] == (None, 17)
+        assert cells[(9, 4)] == ("stale", None)
 
 
 class TestActionPlanner:
@@ -0,0 +1,110 @@
+"""
+Tests for phone number normalization
+Run with: pytest test_phone_numbers.py
+"""
+
+import pytest
+from phone_numbers import PhoneNormalizer, extract_digits, get_normalizer
+from excel_processor import ExcelProcessor
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("0803 123 4567", "+234-803-123-4567"),
+    ("+234 (803) 123-4567", "+234-803-123-4567"),
+    ("2348031234567", "+234-803-123-4567"),
+    (8031234567, "+234-803-123-4567"),
+    (2348031234567.0, "+234-803-123-4567"),
+    ("+1 (415) 555-2671", "+1-415-555-2671"),
+    ("0044 20 7946 0958", "+44-20-7946-0958"),
+    ("+44 (0)20 7946 0958", "+44-20-7946-0958"),
+    ("+44 7700 900123", "+44-7700-900123"),
+    ("+44 121 496 0000", "+44-121-496-0000"),
+    ("+254 712 345 678", "+254-712-345-678"),
+    ("+971 50 123 4567", "+971-50-123-4567"),
+    ("٠٨٠٣١٢٣٤٥٦٧", "+234-803-123-4567"),
+])
+def test_normalize_valid(raw, expected):
+    """Test numbers from several countries and notations"""
+    assert get_normalizer("234").normalize(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["12345", "0987654321", "+999 123 456 789", "n/a", True])
+def test_normalize_invalid(raw):
+    """Test malformed numbers are rejected instead of mangled"""
+    assert get_normalizer("234").normalize(raw) is None
+
+
+def test_default_country():
+    """National numbers follow the default country's rules"""
+    assert PhoneNormalizer("44").normalize("020 7946 0958") == "+44-20-7946-0958"
+    assert PhoneNormalizer("1").normalize("1-415-555-2671") == "+1-415-555-2671"
+
+
+def test_unknown_country_uses_generic_rule():
+    """Codes without rules accept any E.164-length number, ungrouped"""
+    normalizer = PhoneNormalizer("999")
+    assert normalizer.normalize("012 345 678") == "+999-12345678"
+    assert normalizer.normalize("+999 1234") == "+999-1234"
+    assert normalizer.normalize("123") is None
+    assert normalizer.normalize("+44 20 7946 0958") == "+44-20-7946-0958"
+    with pytest.raises(ValueError):
+        PhoneNormalizer("+x")
+
+
+def test_international_code_without_rule():
+    """Assigned country codes without a rule are formatted, not rejected"""
+    normalizer = get_normalizer("234")
+    assert normalizer.normalize("+353 1 234 5678") == "+353-12345678"
+    assert normalizer.normalize("00353 (0)1 234 5678") == "+353-12345678"
+    assert normalizer.normalize("+30 21 0123 4567") == "+30-2101234567"
+    
+    _, stats = normalizer.normalize_batch(["+353 1 234 5678", "+999 123 456 789"])
+    assert (stats["valid"], stats["invalid"]) == (1, 1)
+
+
+def test_extract_digits():
+    """Test translate-based digit extraction"""
+    assert extract_digits("+1 (415) 555-2671 ext.") == "14155552671"
+    assert extract_digits("٠٨٠ abc") == "080"
+
+
+def test_normalize_batch_counts_and_cache():
+    """Test batch stats and that repeated values hit the cache"""
+    normalizer = PhoneNormalizer("234")
+    values = ["0803 123 4567"] * 3 + ["bad", None, " "]
+    
+    normalized, stats = normalizer.normalize_batch(values)
+    
+    assert normalized[:3] == ["+234-803-123-4567"] * 3
+    assert normalized[3:] == ["bad", None, " "]
+    assert stats == {"valid": 3, "invalid": 1, "blank": 2, "invalid_rows": [3]}
+    assert normalizer.normalize_text.cache_info().hits == 2
+
+
+def test_standardize_phone_reports_invalid(tmp_path):
+    """Test processor integration: invalid numbers are counted and kept"""
+    import openpyxl
+    
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Name", "Phone"])
+    ws.append(["Ada", "0803 123 4567"])
+    ws.append(["Bo", "12345"])
+    path = str(tmp_path / "phones.xlsx")
+    wb.save(path)
+    
+    processor = ExcelProcessor(path)
+    processor._standardize_phone({"phone_col": "Phone", "highlight_invalid": True})
+    sheet = processor.workbook.active
+    
+    assert sheet["B2"].value == "+234-803-123-4567"
+    assert sheet["B3"].value == "12345"
+    assert processor.get_diff_summary()["validation"] == {
+        "Sheet!Phone": {"valid": 1, "invalid": 1, "blank": 0}
+    }
+    assert "1 invalid" in processor.changes_log[-1]
+    assert [str(cf.sqref) for cf in sheet.conditional_formatting] == ["B3"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
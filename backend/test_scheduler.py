@@ -0,0 +1,155 @@
+"""
+Tests for the plan scheduler and parallel plan execution
+Run with: pytest test_scheduler.py
+"""
+
+import pytest
+from datetime import date
+from scheduler import next_wave
+from excel_processor import ExcelProcessor, ActionPlanner, make_pool
+
+
+def contacts_rows(phone_header="Phone"):
+    """A contacts sheet with text, phone and date columns"""
+    return [["Name", "City", phone_header, "Date"]] + [
+        [f"  Person {i} ", f"City {i % 5}  ", f"0803 123 {i:04d}", f"2024-01-{i % 28 + 1:02d}"]
+        for i in range(50)
+    ]
+
+
+@pytest.fixture
+def contacts_workbook(make_workbook):
+    return make_workbook(contacts_rows(), title="Contacts")
+
+
+PLAN = [
+    {"type": "trim_clean", "description": "Trim", "params": {"columns": ["Name", "City"]}},
+    {"type": "standardize_phone", "description": "Phones", "params": {"phone_col": "Phone"}},
+    {"type": "convert_dates", "description": "Dates", "params": {"date_col": "Date"}},
+    {"type": "remove_duplicates", "description": "Dedupe", "params": {}},
+    {"type": "trim_clean", "description": "Trim all", "params": {}},
+    {"type": "convert_dates", "description": "Dates again", "params": {"date_col": "Date"}},
+]
+
+# trim_clean also cleans the header, so "Phone " is found as "Phone" afterwards
+PADDED_HEADER_PLAN = [
+    {"type": "trim_clean", "description": "Trim phones", "params": {"columns": ["Phone "]}},
+    {"type": "standardize_phone", "description": "Phones", "params": {"phone_col": "Phone"}},
+    {"type": "convert_dates", "description": "Dates", "params": {"date_col": "Date"}},
+]
+
+
+# What the planner emits for "trim ..., standardize phone ... and convert dates"
+PLANNER_PLAN = ActionPlanner.parse_request("Trim spaces, standardize phone numbers and convert dates")
+
+HEADERS = {"Contacts": ["Name", "City", "Phone", "Date"]}
+
+
+def wave_indexes(plan, start, headers=HEADERS):
+    return [index for index, _ in next_wave(plan, start, "Contacts", headers)]
+
+
+def test_next_wave():
+    """Disjoint column actions share a wave; barriers and overlaps split it"""
+    assert wave_indexes(PLAN, 0) == [0, 1, 2]
+    assert wave_indexes(PLAN, 3) == [3]
+    assert wave_indexes(PLAN, 4) == [4]
+    assert wave_indexes(PLAN, 5) == [5]
+
+
+def test_next_wave_separates_sheets():
+    """Actions on different sheets never conflict"""
+    plan = [
+        {"type": "trim_clean", "params": {"sheet": "A"}},
+        {"type": "trim_clean", "params": {"sheet": "B"}},
+    ]
+    assert wave_indexes(plan, 0, {"A": ["x"], "B": ["x"]}) == [0, 1]
+
+
+def test_planner_trim_runs_with_phone_and_dates():
+    """The planner's trim leaves phone and date data to their own actions"""
+    assert [action["type"] for action in PLANNER_PLAN] == [
+        "trim_clean", "standardize_phone", "convert_dates"
+    ]
+    assert PLANNER_PLAN[0]["params"]["exclude_columns"] == ["Phone", "Date"]
+    assert wave_indexes(PLANNER_PLAN, 0) == [0, 1, 2]
+
+
+def test_trim_exclude_columns_cleans_header_only(make_workbook):
+    """Excluded columns keep their data; their header cell is still cleaned"""
+    path = make_workbook([["Name", "City "], ["  Ann ", " Lagos "]], title="Contacts")
+    processor = ExcelProcessor(path)
+    processor._trim_clean({"exclude_columns": ["City "]})
+    
+    rows = list(processor.workbook["Contacts"].iter_rows(values_only=True))
+    assert rows == [("Name", "City"), ("Ann", " Lagos ")]
+
+
+def test_next_wave_resolves_renamed_headers():
+    """A column found under its trimmed name conflicts with the trim"""
+    headers = {"Contacts": ["Name", "City", "Phone ", "Date"]}
+    wave = next_wave(PADDED_HEADER_PLAN, 0, "Contacts", headers)
+    assert [index for index, _ in wave] == [0]
+    
+    # Once the header is clean, the phone and date columns are independent
+    headers = {"Contacts": ["Name", "City", "Phone", "Date"]}
+    wave = next_wave(PADDED_HEADER_PLAN, 1, "Contacts", headers)
+    assert [(index, footprint["columns"]) for index, footprint in wave] == [(1, [3]), (2, [4])]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("phone_header, plan", [
+    ("Phone", PLAN),
+    ("Phone ", PADDED_HEADER_PLAN),
+    ("Phone", PLANNER_PLAN),
+])
+def test_parallel_matches_serial(make_workbook, executor, phone_header, plan):
+    """Concurrent execution produces the same workbook and change set"""
+    path = make_workbook(contacts_rows(phone_header), title="Contacts")
+    serial = ExcelProcessor(path)
+    serial_results = serial.execute_plan(plan)
+    
+    parallel = ExcelProcessor(path)
+    parallel_results = parallel.execute_plan(plan, max_workers=4, executor=executor)
+    
+    assert parallel_results == serial_results
+    assert parallel_results["errors"] == []
+    assert parallel_results["actions_completed"] == len(plan)
+    
+    def values(processor):
+        return list(processor.workbook["Contacts"].iter_rows(values_only=True))
+    
+    assert values(parallel) == values(serial)
+    assert values(parallel)[0][2] == "Phone"
+    assert values(parallel)[1][2] == "+234-803-123-0000"
+    assert values(parallel)[1][3] == date(2024, 1, 1)
+    assert parallel.change_set.to_dict() == serial.change_set.to_dict()
+
+
+def test_execute_plan_reuses_caller_pool(contacts_workbook):
+    """A pool passed in serves several plans and is left running"""
+    pool = make_pool(2, "thread")
+    try:
+        for _ in range(2):
+            results = ExcelProcessor(contacts_workbook).execute_plan(PLAN, pool=pool)
+            assert results["errors"] == []
+        assert pool.submit(len, "ok").result() == 2
+    finally:
+        pool.shutdown()
+
+
+def test_parallel_reports_action_errors(contacts_workbook):
+    """A failing action in a wave does not stop its neighbours"""
+    processor = ExcelProcessor(contacts_workbook)
+    results = processor.execute_plan([
+        {"type": "standardize_phone", "params": {"phone_col": "Mobile"}},
+        {"type": "convert_dates", "params": {"date_col": "Date"}},
+    ], max_workers=2, executor="thread")
+    
+    assert results["success"] is False
+    assert results["actions_completed"] == 1
+    assert results["errors"] == ["Error in standardize_phone: Column 'Mobile' not found"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
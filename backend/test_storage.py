@@ -0,0 +1,68 @@
+"""
+Tests for Storage backends
+Run with: pytest test_storage.py
+"""
+
+import pytest
+import io
+import os
+from storage import Storage, LocalStorage, SQLiteStorage, get_storage
+
+
+@pytest.fixture(params=[LocalStorage, SQLiteStorage])
+def storage(request, tmp_path):
+    """Create each storage backend in a temporary root"""
+    return request.param(str(tmp_path))
+
+
+class TestStorage:
+    """Test behaviour shared by all storage backends"""
+    
+    def test_upload_roundtrip(self, storage):
+        """Test saving and locating an upload"""
+        path = storage.save_upload("abc", "data.xlsx", io.BytesIO(b"payload"))
+        
+        assert storage.find_upload("abc") == path
+        assert storage.find_upload("missing") is None
+        with open(path, "rb") as f:
+            assert f.read() == b"payload"
+        
+        storage.delete_upload("abc")
+        assert storage.find_upload("abc") is None
+        assert not os.path.exists(path)
+    
+    def test_job_state(self, storage):
+        """Test job records are visible to a second instance on the same root"""
+        storage.put_job("job1", {"status": "completed", "plan": []})
+        other_worker = type(storage)(storage.root)
+        
+        assert other_worker.get_job("job1") == {"status": "completed", "plan": []}
+        assert other_worker.get_job("job2") is None
+    
+    def test_cleanup(self, storage):
+        """Test expired files are removed"""
+        storage.save_upload("old", "data.xlsx", io.BytesIO(b"x"))
+        
+        assert storage.cleanup(upload_ttl=3600, output_ttl=3600) == 0
+        assert storage.cleanup(upload_ttl=-1, output_ttl=3600) == 1
+        assert storage.find_upload("old") is None
+
+
+def test_get_storage_rejects_unknown_backend(tmp_path):
+    """Test backend selection errors"""
+    with pytest.raises(ValueError):
+        get_storage("s3", str(tmp_path))
+
+
+def test_incomplete_backend_cannot_be_created(tmp_path):
+    """Test backends must implement the whole interface"""
+    class UploadsOnly(Storage):
+        def save_upload(self, file_id, filename, fileobj):
+            return ""
+    
+    with pytest.raises(TypeError):
+        UploadsOnly(str(tmp_path))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
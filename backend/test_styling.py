@@ -0,0 +1,107 @@
+"""
+Tests for bulk styling
+Run with: pytest test_styling.py
+"""
+
+import pytest
+import openpyxl
+from styling import StyleRegistry, rows_to_ranges, column_sqref, CHANGED, INVALID
+from excel_processor import ExcelProcessor
+import os
+
+
+@pytest.fixture
+def dirty_workbook(make_workbook):
+    """Workbook with padded names and one duplicate row"""
+    return make_workbook([
+        ["Name", "City"],
+        ["Ann", " Lagos"],
+        ["Ann", " Lagos"],  # Duplicate of row 2
+        [" Ben ", "Abuja"],
+        ["Cy", "Kano "],
+    ], title="Data")
+
+
+def test_rows_to_ranges():
+    """Test row runs and range strings"""
+    assert rows_to_ranges([5, 2, 3, 4, 9]) == [(2, 5), (9, 9)]
+    assert column_sqref(2, [2, 3, 4, 9]) == "B2:B4 B9"
+
+
+def test_named_style_registered_once():
+    """Test styles are shared rather than created per cell"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for i in range(1, 101):
+        ws.cell(row=i, column=1, value=i)
+    
+    registry = StyleRegistry(wb)
+    registry.apply_style(ws, 1, range(1, 101), INVALID)
+    registry.apply_style(ws, 1, range(1, 51), INVALID)
+    
+    assert wb.named_styles.count("ExcelAI Invalid") == 1
+    assert ws.cell(row=100, column=1).style == "ExcelAI Invalid"
+
+
+def test_converted_dates_keep_cell_styling(tmp_path):
+    """Converted dates only change number format; font, fill and border stay"""
+    from openpyxl.styles import Border, Font, PatternFill, Side
+    
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Date"])
+    ws.append(["2024-01-05"])
+    ws.append(["not a date"])
+    ws["A2"].font = Font(bold=True)
+    ws["A2"].fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+    ws["A2"].border = Border(left=Side(style="thin"))
+    path = tmp_path / "styled.xlsx"
+    wb.save(path)
+    
+    processor = ExcelProcessor(str(path))
+    processor._convert_dates({"date_col": "Date"})
+    
+    cell = processor.workbook.active["A2"]
+    assert cell.number_format == "YYYY-MM-DD"
+    assert cell.font.b is True
+    assert cell.fill.fill_type == "solid"
+    assert cell.border.left.style == "thin"
+    assert processor.workbook.active["A3"].number_format == "General"
+
+
+def test_highlight_uses_one_rule(tmp_path):
+    """Highlighting many contiguous rows adds a single compact rule"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for i in range(1, 20001):
+        ws.cell(row=i, column=1, value=i)
+    
+    plain = tmp_path / "plain.xlsx"
+    wb.save(plain)
+    
+    ranges = StyleRegistry(wb).highlight(ws, ((row, 1) for row in range(2, 20001)), CHANGED)
+    highlighted = tmp_path / "highlighted.xlsx"
+    wb.save(highlighted)
+    
+    assert ranges == 1
+    assert os.path.getsize(highlighted) - os.path.getsize(plain) < 2048
+
+
+def test_highlight_changes_tracks_deleted_rows(dirty_workbook):
+    """Edited cells are highlighted at their post-deletion positions"""
+    processor = ExcelProcessor(dirty_workbook)
+    processor.execute_plan([
+        {"type": "trim_clean", "params": {}},
+        {"type": "remove_duplicates", "params": {}},
+    ])
+    
+    processor.highlight_changes()
+    
+    sheet = processor.workbook["Data"]
+    sqrefs = sorted(str(cf.sqref) for cf in sheet.conditional_formatting)
+    # Row 3 (the duplicate) was removed, so " Ben " and "Kano " moved up one row
+    assert sqrefs == ["A3 B2 B4"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,63 @@
+"""
+Tests for worker pre-warming and lazy imports
+Run with: pytest test_warmup.py
+"""
+
+import pytest
+import subprocess
+import sys
+import os
+import warmup
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_api_modules_import_without_heavy_dependencies():
+    """Importing the processing modules must not pull in pandas/openpyxl"""
+    code = (
+        "import sys, excel_processor, data_profiler, change_set, storage; "
+        "print(sorted(m for m in ('pandas', 'openpyxl', 'numpy') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    
+    assert result.stdout.strip() == "[]"
+
+
+def test_prewarm_report():
+    """Test the startup report covers every requested module"""
+    report = warmup.prewarm(["json", "does_not_exist_module"])
+    
+    assert report["pid"] == os.getpid()
+    assert report["modules"]["json"]["cached"] is True
+    assert "error" in report["modules"]["does_not_exist_module"]
+    assert warmup.startup_report() is report
+
+
+def test_init_worker_follows_prewarm_setting(monkeypatch):
+    """Pool processes only pre-warm when EXCELAI_PREWARM is on"""
+    monkeypatch.setattr(warmup, "_report", None)
+    monkeypatch.setenv("EXCELAI_PREWARM", "0")
+    warmup.init_worker(["json"])
+    assert warmup.startup_report() is None
+    
+    monkeypatch.setenv("EXCELAI_PREWARM", "1")
+    warmup.init_worker(["json"])
+    assert "json" in warmup.startup_report()["modules"]
+
+
+def test_warm_pool_runs_initializer(monkeypatch):
+    """Pool processes start (and pre-warm) before any real task"""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    monkeypatch.setenv("EXCELAI_PREWARM", "1")
+    with ProcessPoolExecutor(max_workers=2, initializer=warmup.init_worker, initargs=(["json"],)) as pool:
+        reports = warmup.warm_pool(pool, 2)
+    
+    assert len(reports) == 2
+    assert all(report["pid"] != os.getpid() and "json" in report["modules"] for report in reports)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
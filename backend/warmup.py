@@ -0,0 +1,86 @@
+"""
+Worker Pre-warming
+Imports the heavy processing dependencies ahead of the first request and
+records how long startup took, for API workers and pool processes alike
+"""
+
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import Executor
+from typing import Dict, Any, Iterable, List, Optional
+
+
+# Modules that dominate cold-start time of the processing path
+HEAVY_MODULES = (
+    "numpy",
+    "pandas",
+    "openpyxl",
+    "openpyxl.styles",
+    "openpyxl.formatting.rule",
+)
+
+_report: Optional[Dict[str, Any]] = None
+
+
+def prewarm(modules: Iterable[str] = HEAVY_MODULES) -> Dict[str, Any]:
+    """Import each module and report the time spent (0 if already loaded)"""
+    global _report
+
+    started = time.perf_counter()
+    timings = {}
+
+    for name in modules:
+        cached = name in sys.modules
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            timings[name] = {"error": str(e)}
+            continue
+        timings[name] = {
+            "ms": round((time.perf_counter() - t0) * 1000, 2),
+            "cached": cached,
+        }
+
+    _report = {
+        "pid": os.getpid(),
+        "modules": timings,
+        "total_ms": round((time.perf_counter() - started) * 1000, 2),
+        "warmed_at": time.time(),
+    }
+    return _report
+
+
+def init_worker(modules: Iterable[str] = HEAVY_MODULES):
+    """
+    Initializer for process pools: pass as initializer=init_worker. Pool
+    processes inherit EXCELAI_PREWARM, so they pre-warm only when the API
+    worker that owns them does.
+    """
+    if prewarm_enabled():
+        prewarm(modules)
+
+
+def warm_pool(pool: Executor, workers: int) -> List[Optional[Dict[str, Any]]]:
+    """
+    Start a pool's workers now instead of on the first real task: process
+    pools only spawn processes (and run init_worker) when work is submitted.
+    Returns each task's startup report.
+    """
+    return list(pool.map(_task_report, range(workers)))
+
+
+def _task_report(_: int) -> Optional[Dict[str, Any]]:
+    return startup_report()
+
+
+def startup_report() -> Optional[Dict[str, Any]]:
+    """The report from the last prewarm() in this process, if any"""
+    return _report
+
+
+def prewarm_enabled() -> bool:
+    """Pre-warming is opt-in through EXCELAI_PREWARM=1"""
+    return os.environ.get("EXCELAI_PREWARM", "0").lower() in ("1", "true", "yes")